@@ -0,0 +1,335 @@
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+
+# Pruebas diferenciales entre todas las versiones del laberinto: genera laberintos al azar,
+# los resuelve con cada motor, valida los caminos contra un BFS de referencia y compara los
+# tiempos con una línea base guardada
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+MOVES = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+# Cargar laberinto.py (u otro módulo) de una carpeta con un nombre propio, para que las cuatro
+# copias de Maze convivan en el mismo proceso
+def load(folder, module="laberinto"):
+    path = os.path.join(ROOT, folder)
+    sys.path.insert(0, path)
+    for name in ("laberinto", "instrumentation"):
+        sys.modules.pop(name, None)
+    try:
+        spec = importlib.util.spec_from_file_location(f"{folder}.{module}", os.path.join(path, module + ".py"))
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+        return loaded
+    finally:
+        sys.path.remove(path)
+
+
+def maze_solver(folder, method, **options):
+    def prepare(modules, filename):
+        maze = modules[folder].Maze(filename)
+
+        def run():
+            getattr(maze, method)(**options)
+            return maze.solution
+        return run
+    return prepare
+
+
+def distance_field(modules, filename):
+    maze = modules["laberinto_A*"].Maze(filename)
+    return lambda: maze.path_from(maze.start)
+
+
+# solve_many con otra consulta antes de la del caso, en el mismo proceso: las cachés que
+# dependen del inicio y la meta (como el grafo reducido) no pueden arrastrarse entre consultas
+def shared_queries(method):
+    def prepare(modules, filename):
+        maze = modules["laberinto_A*"].Maze(filename)
+        component = maze.component(maze.start)
+        others = [(i, j) for i in range(maze.height) for j in range(maze.width)
+                  if not maze.walls[i][j] and maze.component((i, j)) == component
+                  and (i, j) not in (maze.start, maze.goal)]
+        queries = [(others[0], others[-1])] if others else []
+        queries.append((maze.start, maze.goal))
+
+        def run():
+            # Los procesos importan laberinto y shared desde la carpeta de A*
+            path = os.path.join(ROOT, "laberinto_A*")
+            sys.path.insert(0, path)
+            sys.modules.pop("laberinto", None)
+            try:
+                result = maze.solve_many(queries, method=method, workers=1)[-1]
+            finally:
+                sys.path.remove(path)
+            if "error" in result:
+                raise Exception(result["error"])
+            return result["actions"], result["cells"]
+        return run
+    return prepare
+
+
+def out_of_core(modules, filename):
+    outofcore = modules["outofcore"]
+    outofcore.pack_walls(filename, filename + ".grid")
+    return lambda: outofcore.solve_out_of_core(filename + ".grid", os.path.dirname(filename))[0]
+
+
+# Motores: nombre -> (preparación, garantía). La garantía es 1 si el camino es óptimo,
+# un factor si su largo está acotado y None si solo tiene que ser válido
+ENGINES = {
+    "bfs": (maze_solver("laberinto_bfs", "solve"), 1),
+    "dfs": (maze_solver("laberinto_dfs", "solve"), None),
+    "greedy": (maze_solver("laberinto_Greddy", "solve_greedy"), None),
+    "outofcore": (out_of_core, 1),
+    "astar.bfs": (maze_solver("laberinto_A*", "solve"), 1),
+    "astar.bitboard": (maze_solver("laberinto_A*", "solve_bitboard"), 1),
+    "astar.greedy": (maze_solver("laberinto_A*", "solve_greedy"), None),
+    "astar.a_star": (maze_solver("laberinto_A*", "solve_a_star"), 1),
+    "astar.alt": (maze_solver("laberinto_A*", "solve_a_star", use_landmarks=True), 1),
+    "astar.weighted": (maze_solver("laberinto_A*", "solve_weighted_a_star", epsilon=0.5), 1.5),
+    "astar.beam": (maze_solver("laberinto_A*", "solve_beam"), None),
+    "astar.reduced": (maze_solver("laberinto_A*", "solve_reduced"), 1),
+    "astar.rsr": (maze_solver("laberinto_A*", "solve_rsr"), 1),
+    "astar.ida_star": (maze_solver("laberinto_A*", "solve_ida_star"), 1),
+    "astar.sma_star": (maze_solver("laberinto_A*", "solve_sma_star"), 1),
+    "astar.field": (distance_field, 1),
+    "astar.tree": (maze_solver("laberinto_A*", "solve_tree"), 1),
+    "astar.many_reduced": (shared_queries("solve_reduced"), 1),
+}
+
+# Errores que no son fallas: el haz puede perder el camino aunque exista y el índice de
+# árbol solo se arma en laberintos perfectos
+ALLOWED_ERRORS = {
+    "astar.beam": {"no solution within beam width"},
+    "astar.tree": {"maze is not perfect"},
+}
+
+
+def load_modules():
+    return {
+        "laberinto_bfs": load("laberinto_bfs"),
+        "laberinto_dfs": load("laberinto_dfs"),
+        "laberinto_Greddy": load("laberinto_Greddy"),
+        "laberinto_A*": load("laberinto_A*"),
+        "outofcore": load("laberinto_bfs", "outofcore"),
+    }
+
+
+# Generar un laberinto al azar: paredes sueltas, laberinto perfecto o habitaciones abiertas
+def generate(rnd, max_size):
+    height = rnd.randint(1, max_size)
+    width = rnd.randint(2 if height == 1 else 1, max_size)
+    kind = rnd.choice(["random", "perfect", "rooms"])
+
+    if kind == "random":
+        density = rnd.uniform(0, 0.5)
+        grid = [["#" if rnd.random() < density else " " for _ in range(width)] for _ in range(height)]
+    elif kind == "perfect":
+        # Backtracking recursivo sobre las celdas de coordenadas pares
+        grid = [["#"] * width for _ in range(height)]
+        stack = [(0, 0)]
+        grid[0][0] = " "
+        while stack:
+            row, col = stack[-1]
+            options = [(row + dr, col + dc, dr // 2, dc // 2)
+                       for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                       if 0 <= row + dr < height and 0 <= col + dc < width and grid[row + dr][col + dc] == "#"]
+            if not options:
+                stack.pop()
+                continue
+            r, c, dr, dc = rnd.choice(options)
+            grid[row + dr][col + dc] = " "
+            grid[r][c] = " "
+            stack.append((r, c))
+    else:
+        grid = [[" "] * width for _ in range(height)]
+        for _ in range(rnd.randint(0, 4)):
+            r0, c0 = rnd.randrange(height), rnd.randrange(width)
+            r1, c1 = rnd.randrange(r0, height), rnd.randrange(c0, width)
+            for r in range(r0, r1 + 1):
+                grid[r][c0] = grid[r][c1] = "#"
+            for c in range(c0, c1 + 1):
+                grid[r0][c] = grid[r1][c] = "#"
+        for _ in range(rnd.randint(0, width * height // 10)):
+            grid[rnd.randrange(height)][rnd.randrange(width)] = " "
+
+    (r0, c0), (r1, c1) = rnd.sample([(r, c) for r in range(height) for c in range(width)], 2)
+    grid[r0][c0] = "A"
+    grid[r1][c1] = "B"
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+# Distancia más corta según un BFS independiente de todos los motores (None si no hay camino)
+def reference(contents):
+    lines = contents.splitlines()
+    height = len(lines)
+    width = max(len(line) for line in lines)
+    free = {(i, j) for i, line in enumerate(lines) for j in range(width)
+            if j >= len(line) or line[j] in " AB"}
+    start = next((i, line.index("A")) for i, line in enumerate(lines) if "A" in line)
+    goal = next((i, line.index("B")) for i, line in enumerate(lines) if "B" in line)
+
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        row, col = queue.popleft()
+        for dr, dc in MOVES.values():
+            cell = (row + dr, col + dc)
+            if cell in free and cell not in distance:
+                distance[cell] = distance[(row, col)] + 1
+                queue.append(cell)
+    return start, goal, free, distance.get(goal)
+
+
+# Comprobar que el camino sale del inicio, no atraviesa paredes y termina en la meta
+def check_path(solution, start, goal, free):
+    actions, cells = solution
+    if len(actions) != len(cells):
+        return "actions and cells differ in length"
+    position = start
+    for action, cell in zip(actions, cells):
+        if action not in MOVES:
+            return f"unknown action {action!r}"
+        position = (position[0] + MOVES[action][0], position[1] + MOVES[action][1])
+        if tuple(cell) != position:
+            return f"cell {tuple(cell)} does not follow {action!r}"
+        if position not in free:
+            return f"path crosses a wall at {position}"
+    if position != goal:
+        return "path does not end at the goal"
+    return None
+
+
+# Resolver un laberinto con cada motor; devuelve las fallas y suma los tiempos en timings
+def run_case(modules, engines, contents, directory, repeat, timings):
+    start, goal, free, optimal = reference(contents)
+    failures = []
+    for name in engines:
+        prepare, guarantee = ENGINES[name]
+        best = None
+        for _ in range(repeat):
+            # Un laberinto nuevo por corrida, así ninguna caché sobrevive entre repeticiones
+            case = tempfile.mkdtemp(dir=directory)
+            filename = os.path.join(case, "laberinto.txt")
+            with open(filename, "w") as f:
+                f.write(contents)
+            try:
+                solve = prepare(modules, filename)
+                begin = time.perf_counter()
+                try:
+                    solution = solve()
+                    error = None
+                except Exception as e:
+                    solution = None
+                    error = str(e) or type(e).__name__
+                elapsed = time.perf_counter() - begin
+            finally:
+                shutil.rmtree(case, ignore_errors=True)
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = timings.get(name, 0) + best
+
+        if error is not None:
+            if optimal is None and error == "no solution":
+                continue
+            if error in ALLOWED_ERRORS.get(name, ()):
+                continue
+            expected = "no solution" if optimal is None else f"a path of length {optimal}"
+            failures.append(f"{name}: raised {error!r}, expected {expected}")
+            continue
+        if optimal is None:
+            failures.append(f"{name}: found a path but the goal is unreachable")
+            continue
+        problem = check_path(solution, start, goal, free)
+        if problem is not None:
+            failures.append(f"{name}: {problem}")
+        elif guarantee is not None and len(solution[0]) > guarantee * optimal:
+            failures.append(f"{name}: path length {len(solution[0])}, optimal is {optimal}")
+    return failures
+
+
+# Motores cuyo tiempo total supera al de la línea base en más de threshold (fracción)
+def regressions(timings, baseline, threshold):
+    slow = []
+    for name, elapsed in sorted(timings.items()):
+        before = baseline.get(name)
+        if before and elapsed > before * (1 + threshold):
+            slow.append((name, before, elapsed))
+    return slow
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pruebas diferenciales y de rendimiento entre motores")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-size", type=int, default=20)
+    parser.add_argument("--engines", help="lista separada por comas (por defecto, todos)")
+    parser.add_argument("--repeat", type=int, default=3, help="corridas por caso; se toma el mejor tiempo")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "fuzz_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="guardar los tiempos como nueva línea base")
+    parser.add_argument("--threshold", type=float, default=0.25, help="regresión tolerada (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    engines = args.engines.split(",") if args.engines else list(ENGINES)
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        sys.exit(f"unknown engines: {', '.join(unknown)}")
+
+    modules = load_modules()
+    rnd = random.Random(args.seed)
+    timings = {}
+    failed = 0
+    directory = tempfile.mkdtemp(prefix="laberinto-fuzz-")
+    try:
+        for i in range(args.cases):
+            contents = generate(rnd, args.max_size)
+            failures = run_case(modules, engines, contents, directory, args.repeat, timings)
+            if failures:
+                failed += 1
+                print(f"Caso {i} (semilla {args.seed}):")
+                print(contents, end="")
+                for failure in failures:
+                    print("  -", failure)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"Casos: {args.cases}, con fallas: {failed}")
+    for name in engines:
+        print(f"  {name:16} {timings.get(name, 0) * 1000:10.1f} ms")
+
+    # La línea base solo es comparable si se generaron los mismos casos
+    workload = {"cases": args.cases, "seed": args.seed, "max_size": args.max_size, "repeat": args.repeat}
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("workload") != workload:
+            baseline = None
+            if not args.save_baseline:
+                print("La línea base se midió con otros casos; no se compara")
+
+    slow = []
+    if args.save_baseline:
+        saved = baseline["timings"] if baseline is not None else {}
+        saved.update(timings)
+        with open(args.baseline, "w") as f:
+            json.dump({"workload": workload, "timings": saved}, f, indent=2, sort_keys=True)
+    elif baseline is not None:
+        slow = regressions(timings, baseline["timings"], args.threshold)
+        for name, before, elapsed in slow:
+            print(f"Regresión: {name} {before * 1000:.1f} ms -> {elapsed * 1000:.1f} ms")
+
+    if failed or slow:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
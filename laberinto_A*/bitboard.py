@@ -0,0 +1,97 @@
+ACTIONS = [("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1)]
+
+
+# Grilla como bitboards: un entero por fila con el bit j encendido si la columna j está libre.
+# Cada nivel del BFS expande todo el frente de una fila con desplazamientos y máscaras
+# (sin recorrer celda por celda), solo con enteros de Python
+class Bitboard():
+    def __init__(self, maze):
+        self.height = maze.height
+        self.width = maze.width
+        self.open = []
+        for row in maze.walls:
+            bits = 0
+            for j, wall in enumerate(row):
+                if not wall:
+                    bits |= 1 << j
+            self.open.append(bits)
+
+    # BFS por niveles desde source. Cada nivel es un diccionario fila -> bits de las celdas
+    # alcanzadas a esa distancia (solo filas no vacías). Se detiene al alcanzar goal, o recorre
+    # toda la componente si goal es None. Devuelve (niveles, celdas alcanzadas)
+    def levels(self, source, goal=None):
+        last = self.height - 1
+        remaining = list(self.open)  # Celdas libres todavía no alcanzadas
+        row, col = source
+        if not remaining[row] >> col & 1:
+            raise Exception("source must be an open cell")
+        remaining[row] ^= 1 << col
+        frontier = {row: 1 << col}
+        levels = [frontier]
+        reached = 1
+        if goal is not None:
+            goal_row, goal_bit = goal[0], 1 << goal[1]
+            if source == goal:
+                return levels, reached
+
+        while True:
+            following = {}
+            rows = set()
+            for r in frontier:
+                rows.add(r)
+                if r > 0:
+                    rows.add(r - 1)
+                if r < last:
+                    rows.add(r + 1)
+            for r in rows:
+                bits = frontier.get(r, 0)
+                spread = bits | bits << 1 | bits >> 1 | frontier.get(r - 1, 0) | frontier.get(r + 1, 0)
+                new = spread & remaining[r]
+                if new:
+                    remaining[r] ^= new
+                    following[r] = new
+                    reached += bin(new).count("1")
+            if not following:
+                return levels, reached
+            levels.append(following)
+            frontier = following
+            if goal is not None and following.get(goal_row, 0) & goal_bit:
+                return levels, reached
+
+    # Celdas alcanzables desde source, como una máscara de bits por fila
+    def reachable(self, source):
+        rows = [0] * self.height
+        for level in self.levels(source)[0]:
+            for r, bits in level.items():
+                rows[r] |= bits
+        return rows
+
+    # Distancia BFS entre dos celdas, o None si no hay camino
+    def distance(self, source, goal):
+        levels = self.levels(source, goal)[0]
+        last = levels[-1]
+        if not last.get(goal[0], 0) >> goal[1] & 1:
+            return None
+        return len(levels) - 1
+
+    # Camino más corto como (acciones, celdas, celdas alcanzadas): desde la meta se retrocede
+    # buscando en el nivel anterior un vecino alcanzado, así no hace falta guardar padres
+    def path(self, source, goal):
+        levels, reached = self.levels(source, goal)
+        row, col = goal
+        if not levels[-1].get(row, 0) >> col & 1:
+            raise Exception("no solution")
+
+        actions = []
+        cells = []
+        for level in reversed(levels[:-1]):
+            for action, dr, dc in ACTIONS:
+                r, c = row - dr, col - dc
+                if c >= 0 and level.get(r, 0) >> c & 1:
+                    actions.append(action)
+                    cells.append((row, col))
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+        return actions, cells, reached
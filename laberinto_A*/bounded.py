@@ -0,0 +1,247 @@
+import heapq
+import itertools
+
+INFINITY = float("inf")
+
+
+# IDA*: búsqueda en profundidad con cota f creciente; la memoria es el camino actual
+# más una tabla de transposición (estado -> menor costo visto) con tamaño máximo
+def ida_star(maze, heuristic, max_table=100000):
+    start, goal = maze.start, maze.goal
+    stats = maze.stats
+    bound = heuristic(start, goal)
+    num_explored = 0
+
+    while True:
+        table = {}
+        path = [start]
+        actions = []
+        on_path = {start}
+        stack = [iter(maze.neighbors(start))]
+        next_bound = INFINITY
+        num_explored += 1
+
+        while stack:
+            try:
+                action, state = next(stack[-1])
+            except StopIteration:
+                # Retroceder
+                stack.pop()
+                on_path.discard(path.pop())
+                if actions:
+                    actions.pop()
+                continue
+
+            if state in on_path:
+                continue
+            cost = len(path)
+            f = cost + heuristic(state, goal)
+            if f > bound:
+                next_bound = min(next_bound, f)
+                continue
+
+            # Si ya se llegó a este estado con menor o igual costo en esta iteración, se poda
+            if table.get(state, INFINITY) <= cost:
+                if stats is not None:
+                    stats.duplicate(state)
+                continue
+            if len(table) < max_table:
+                table[state] = cost
+
+            num_explored += 1
+            if stats is not None:
+                stats.expand(state)
+            path.append(state)
+            actions.append(action)
+            on_path.add(state)
+            if state == goal:
+                return actions, path[1:], num_explored
+            stack.append(iter(maze.neighbors(state)))
+
+        if next_bound == INFINITY:
+            raise Exception("no solution")
+        bound = next_bound
+
+
+# Nodo de SMA*: guarda sus hijos en memoria y el f de los hijos olvidados
+class SMANode():
+    def __init__(self, state, parent, action, cost, f, depth):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+        self.f = f
+        self.depth = depth
+        self.children = []
+        self.fresh = None  # Sucesores aún no generados (None si no se ha expandido)
+        self.forgotten = {}  # estado -> (acción, f) de los hijos eliminados por falta de memoria
+        self.in_open = False
+        self.version = 0
+
+
+# SMA*: A* que nunca guarda más de max_nodes nodos; cuando se llena olvida la hoja
+# menos prometedora y conserva su f en el padre para regenerarla si hace falta.
+# Es búsqueda en grafo: de cada estado queda en memoria a lo sumo un nodo (el de menor costo),
+# así no se regeneran todos los caminos de igual costo hacia una misma celda
+def sma_star(maze, heuristic, max_nodes=10000):
+    if max_nodes < 2:
+        raise Exception("node budget too small")
+
+    goal = maze.goal
+    stats = maze.stats
+    counter = itertools.count()
+    best = []   # (f, -profundidad): el mejor y más profundo primero
+    held = {}   # estado -> nodo en memoria (cuenta para max_nodes: uno por nodo)
+    worst = []  # (-f, profundidad): el peor y menos profundo primero
+
+    def push(node):
+        node.version += 1
+        heapq.heappush(best, (node.f, -node.depth, next(counter), node.version, node))
+        heapq.heappush(worst, (-node.f, node.depth, next(counter), node.version, node))
+        if len(worst) > 4 * max_nodes:
+            compact()
+
+    # Las entradas viejas de los montículos mantienen vivos a los nodos olvidados: si se
+    # acumulan, se descartan para que la memoria siga acotada por max_nodes
+    def compact():
+        for heap in (best, worst):
+            heap[:] = [entry for entry in heap if entry[3] == entry[4].version]
+            heapq.heapify(heap)
+
+    # Actualizar el f de un nodo con el de sus hijos y propagarlo a sus ancestros
+    def backup(node):
+        while node is not None and node.fresh is not None and not node.fresh:
+            values = [child.f for child in node.children]
+            values.extend(f for _, f in node.forgotten.values())
+            f = min(values) if values else INFINITY
+            if f == node.f:
+                break
+            node.f = f
+            push(node)
+            node = node.parent
+
+    # Olvidar la hoja menos prometedora (nunca el nodo que se está expandiendo)
+    def evict(current):
+        skipped = False
+        while worst:
+            _, _, _, version, node = heapq.heappop(worst)
+            if version != node.version or node.children or node.parent is None:
+                continue
+            if node is current:
+                skipped = True
+                continue
+            parent = node.parent
+            parent.children.remove(node)
+            del held[node.state]
+            if node.f != INFINITY:
+                parent.forgotten[node.state] = (node.action, node.f)
+                parent.in_open = True
+            node.in_open = False
+            node.version += 1
+            backup(parent)
+            push(parent)
+            if skipped:
+                push(current)
+            return
+        raise Exception("node budget too small")
+
+    # Quitar un nodo con todo su subárbol (se encontró un camino más corto a su estado);
+    # el padre no lo recuerda porque ese estado ya tiene un nodo mejor. Devuelve cuántos quitó
+    def prune(node):
+        parent = node.parent
+        parent.children.remove(node)
+        removed = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children)
+            del held[node.state]
+            node.in_open = False
+            node.version += 1
+            removed += 1
+        backup(parent)
+        push(parent)
+        return removed
+
+    root = SMANode(maze.start, None, None, 0, heuristic(maze.start, goal), 0)
+    root.in_open = True
+    push(root)
+    held[root.state] = root
+    used = 1
+    num_explored = 0
+    cutoff = False
+
+    while True:
+        while best:
+            _, _, _, version, node = best[0]
+            if version == node.version and node.in_open:
+                break
+            heapq.heappop(best)
+        else:
+            raise Exception("node budget too small" if cutoff else "no solution")
+
+        node = best[0][4]
+        if node.f == INFINITY:
+            raise Exception("node budget too small" if cutoff else "no solution")
+
+        if node.state == goal:
+            actions = []
+            cells = []
+            while node.parent is not None:
+                actions.append(node.action)
+                cells.append(node.state)
+                node = node.parent
+            actions.reverse()
+            cells.reverse()
+            return actions, cells, num_explored
+
+        if node.fresh is None:
+            back = node.parent.state if node.parent is not None else None
+            node.fresh = [(a, s) for a, s in maze.neighbors(node.state) if s != back]
+            num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
+
+        # Generar el siguiente sucesor: primero los nuevos, luego los olvidados
+        if node.fresh:
+            action, state = node.fresh.pop(0)
+            # Un camino de largo L ocupa L + 1 nodos: si f ya lo supera, no cabe en memoria
+            f = max(node.f, node.cost + 1 + heuristic(state, goal))
+            if f > max_nodes - 1:
+                f = INFINITY
+                cutoff = True
+        elif node.forgotten:
+            state = min(node.forgotten, key=lambda s: node.forgotten[s][1])
+            action, f = node.forgotten.pop(state)
+        else:
+            # Callejón sin salida
+            node.in_open = False
+            backup(node)
+            continue
+
+        # Si el estado ya está en memoria con menor o igual costo se descarta el sucesor;
+        # si está con mayor costo, se quita ese nodo (y su subárbol) y queda el nuevo
+        other = held.get(state)
+        if other is not None and other.cost <= node.cost + 1:
+            if stats is not None:
+                stats.duplicate(state)
+        else:
+            if other is not None:
+                used -= prune(other)
+            if used >= max_nodes:
+                evict(node)
+                used -= 1
+
+            child = SMANode(state, node, action, node.cost + 1, f, node.depth + 1)
+            child.in_open = True
+            node.children.append(child)
+            held[state] = child
+            push(child)
+            used += 1
+            if stats is not None:
+                stats.generate(state, used)
+
+        if not node.fresh:
+            backup(node)
+            if not node.forgotten:
+                node.in_open = False
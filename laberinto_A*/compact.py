@@ -0,0 +1,93 @@
+import base64
+import struct
+
+ACTIONS = ["up", "down", "left", "right"]
+CODES = {action: code for code, action in enumerate(ACTIONS)}
+MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Formato binario: cabecera + tramos
+HEADER = struct.Struct("<III")  # fila y columna de inicio, cantidad de pasos
+
+
+# Solución compacta: la celda de inicio y los tramos rectos del camino. Cada tramo es un entero
+# (largo - 1) * 4 + acción (2 bits) guardado como varint, así un pasillo largo ocupa pocos bytes.
+# Se comporta como la tupla (acciones, celdas) de Maze.solution y se decodifica recién al usarla
+class CompactPath():
+    def __init__(self, start, steps, runs):
+        self.start = tuple(start)
+        self.steps = steps
+        self.runs = bytes(runs)
+        self.decoded = None
+
+    @classmethod
+    def encode(cls, start, actions):
+        runs = bytearray()
+        i = 0
+        while i < len(actions):
+            j = i + 1
+            while j < len(actions) and actions[j] == actions[i]:
+                j += 1
+            value = (j - i - 1) << 2 | CODES[actions[i]]
+            while value >= 0x80:
+                runs.append(value & 0x7F | 0x80)
+                value >>= 7
+            runs.append(value)
+            i = j
+        return cls(start, len(actions), runs)
+
+    # Tramos rectos como (acción, largo), sin decodificar el camino entero
+    def segments(self):
+        value = 0
+        shift = 0
+        for byte in self.runs:
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            yield ACTIONS[value & 3], (value >> 2) + 1
+            value = 0
+            shift = 0
+
+    def decode(self):
+        if self.decoded is None:
+            actions = []
+            cells = []
+            row, col = self.start
+            for action, length in self.segments():
+                dr, dc = MOVES[CODES[action]]
+                actions.extend([action] * length)
+                for _ in range(length):
+                    row += dr
+                    col += dc
+                    cells.append((row, col))
+            self.decoded = (actions, cells)
+        return self.decoded
+
+    def __getitem__(self, index):
+        return self.decode()[index]
+
+    def __iter__(self):
+        return iter(self.decode())
+
+    def __len__(self):
+        return 2
+
+    # Al serializar (pickle entre procesos) no se envía lo ya decodificado
+    def __getstate__(self):
+        return {"start": self.start, "steps": self.steps, "runs": self.runs, "decoded": None}
+
+    def to_bytes(self):
+        return HEADER.pack(self.start[0], self.start[1], self.steps) + self.runs
+
+    @classmethod
+    def from_bytes(cls, data):
+        row, col, steps = HEADER.unpack_from(data)
+        return cls((row, col), steps, data[HEADER.size:])
+
+    # Texto base64 para las salidas JSON
+    def to_text(self):
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def from_text(cls, text):
+        return cls.from_bytes(base64.b64decode(text))
@@ -0,0 +1,273 @@
+import heapq
+import itertools
+from collections import deque
+
+INFINITY = float("inf")
+
+
+# Distancias exactas hacia una meta calculadas a demanda (Reverse Resumable A*): un A* desde
+# la meta hacia target que se retoma cada vez que se pide una celda todavía no cerrada.
+# Solo guarda las celdas que recorrió, no un arreglo del tamaño de la grilla
+class ReverseSearch():
+    def __init__(self, maze, goal, target):
+        self.maze = maze
+        self.target = target
+        self.costs = {goal: 0}
+        self.closed = set()
+        self.heap = [(self.estimate(goal), 0, goal)]  # (f, -costo, celda): a igual f, la más lejana a la meta
+
+    def estimate(self, cell):
+        return abs(cell[0] - self.target[0]) + abs(cell[1] - self.target[1])
+
+    def distance(self, cell):
+        if cell in self.closed:
+            return self.costs[cell]
+        costs = self.costs
+        while self.heap:
+            _, cost, state = heapq.heappop(self.heap)
+            cost = -cost
+            if state in self.closed or cost > costs[state]:
+                continue
+            self.closed.add(state)
+            for _, neighbor in self.maze.neighbors(state):
+                if cost + 1 < costs.get(neighbor, INFINITY):
+                    costs[neighbor] = cost + 1
+                    heapq.heappush(self.heap, (cost + 1 + self.estimate(neighbor), -(cost + 1), neighbor))
+            if state == cell:
+                return cost
+        return INFINITY
+
+
+# WHCA* (A* cooperativo con ventana): cada commit ticks todos los agentes replanifican en orden
+# de prioridad. Cada uno busca en espacio-tiempo un camino de window pasos que respete las
+# reservas de los anteriores y ejecuta los primeros commit pasos. La heurística es la distancia
+# real a su meta (ReverseSearch). Si un agente no encuentra camino se queda quieto, y quien
+# había reservado su celda pierde su plan y vuelve a buscar: así nunca hay choques. La prioridad
+# favorece a los agentes que llevan más rondas sin acercarse a su meta, para que se destraben
+class CooperativePlanner():
+    def __init__(self, maze, agents, window=8, commit=None, max_expansions=None, budget=None):
+        self.maze = maze
+        self.window = window
+        self.commit = min(window, commit) if commit is not None else max(1, window // 2)
+        self.max_expansions = max_expansions if max_expansions is not None else 64 * window
+        self.budget = budget  # Búsquedas por ronda como máximo (None: sin límite)
+
+        self.starts = [tuple(start) for start, _ in agents]
+        self.goals = [tuple(goal) for _, goal in agents]
+        if len(set(self.starts)) != len(self.starts):
+            raise Exception("agents must start on different cells")
+        for start, goal in zip(self.starts, self.goals):
+            for row, col in (start, goal):
+                if not (0 <= row < maze.height and 0 <= col < maze.width) or maze.walls[row][col]:
+                    raise Exception("agents must start and end on open cells")
+            if not maze.connected(start, goal):
+                raise Exception("no solution")
+
+        # Una búsqueda inversa por meta, compartida por los agentes que van al mismo lugar
+        searches = {}
+        for start, goal in zip(self.starts, self.goals):
+            if goal not in searches:
+                searches[goal] = ReverseSearch(maze, goal, start)
+        self.distances = [searches[goal] for goal in self.goals]
+
+        self.tick = 0
+        self.rounds = 0
+        self.positions = list(self.starts)
+        self.history = [[start] for start in self.starts]
+        self.plans = [deque() for _ in self.starts]
+        self.tails = [[] for _ in self.starts]  # Pasos de la ventana que quedaron sin ejecutar
+        self.reserved = {}  # (celda, tiempo) -> agente
+        self.moves = set()  # (desde, hasta, tiempo) de cada movimiento reservado
+        self.keys = [[] for _ in self.starts]  # Reservas de cada agente, para borrarlas si pierde su plan
+        self.stuck = [0] * len(self.starts)  # Rondas seguidas sin acercarse a la meta
+        self.last = [INFINITY] * len(self.starts)
+        self.searched = set()  # Agentes que buscaron en la última ronda
+        self.num_explored = 0
+
+    def free(self, agent, cell, t):
+        owner = self.reserved.get((cell, t))
+        return owner is None or owner == agent
+
+    # Búsqueda en espacio-tiempo de window pasos (esperar también es una acción); devuelve las
+    # celdas de los próximos pasos o None si no encontró nada dentro del límite de expansiones
+    def search(self, agent):
+        maze = self.maze
+        distance = self.distances[agent].distance
+        goal = self.goals[agent]
+        now = self.tick
+        start = self.positions[agent]
+        counter = itertools.count()
+
+        heap = [(distance(start), 0, next(counter), start)]
+        costs = {(start, 0): 0}
+        parents = {(start, 0): None}
+        closed = set()
+        expansions = 0
+        while heap:
+            _, negative_depth, _, cell = heapq.heappop(heap)
+            node = (cell, -negative_depth)
+            if node in closed:
+                continue
+            closed.add(node)
+            depth = node[1]
+
+            if depth == self.window:
+                path = []
+                while node[1] > 0:
+                    path.append(node[0])
+                    node = parents[node]
+                path.reverse()
+                return path
+
+            expansions += 1
+            self.num_explored += 1
+            if expansions > self.max_expansions:
+                return None
+
+            t = now + depth + 1
+            for following in [cell] + [state for _, state in maze.neighbors(cell)]:
+                child = (following, depth + 1)
+                if child in closed or not self.free(agent, following, t):
+                    continue
+                if following != cell and (following, cell, t) in self.moves:
+                    continue  # Intercambio de celdas con otro agente
+                # Esperar en la meta no cuesta: así los agentes que llegaron se quedan quietos
+                cost = costs[node] + (0 if following == cell == goal else 1)
+                if cost < costs.get(child, cost + 1):
+                    costs[child] = cost
+                    parents[child] = node
+                    heapq.heappush(heap, (cost + distance(following), -(depth + 1), next(counter), following))
+        return None
+
+    def reserve(self, agent, path):
+        previous = self.positions[agent]
+        for k, cell in enumerate(path, start=1):
+            t = self.tick + k
+            self.reserved[(cell, t)] = agent
+            self.keys[agent].append((cell, t))
+            if cell != previous:
+                self.moves.add((previous, cell, t))
+                self.keys[agent].append((previous, cell, t))
+            previous = cell
+
+    # El camino se puede reservar tal cual (sin choques ni intercambios con lo ya reservado)
+    def fits(self, agent, path):
+        previous = self.positions[agent]
+        for k, cell in enumerate(path, start=1):
+            t = self.tick + k
+            if not self.free(agent, cell, t) or (cell != previous and (cell, previous, t) in self.moves):
+                return False
+            previous = cell
+        return True
+
+    def release(self, agent):
+        for key in self.keys[agent]:
+            if len(key) == 3:
+                self.moves.discard(key)
+            elif self.reserved.get(key) == agent:
+                del self.reserved[key]
+        self.keys[agent] = []
+
+    # Quedarse quieto los próximos commit pasos, aunque otro ya haya reservado la celda:
+    # esos agentes pierden su plan. Devuelve la lista de desplazados
+    def stay(self, agent):
+        cell = self.positions[agent]
+        displaced = []
+        for t in range(self.tick + 1, self.tick + self.commit + 1):
+            owner = self.reserved.get((cell, t))
+            if owner is not None and owner != agent and owner not in displaced:
+                displaced.append(owner)
+        for other in displaced:
+            self.release(other)
+        self.reserve(agent, [cell] * self.commit)
+        return displaced
+
+    # Replanificar a todos los agentes en orden de prioridad
+    def plan(self):
+        count = len(self.starts)
+        for agent in range(count):
+            # Solo se mide el avance de quien buscó en la ronda anterior (su búsqueda inversa ya
+            # llegó cerca); quien no buscó cuenta como trabado
+            if self.positions[agent] == self.goals[agent]:
+                self.stuck[agent] = 0
+                continue
+            if agent in self.searched:
+                d = self.distances[agent].distance(self.positions[agent])
+                if d < self.last[agent]:
+                    self.stuck[agent] = 0
+                    self.last[agent] = d
+                    continue
+            self.stuck[agent] += 1
+        self.searched = set()
+        self.reserved = {}
+        self.moves = set()
+        self.keys = [[] for _ in range(count)]
+
+        # Primero los más trabados, los que ya llegaron al final; el resto rota en cada ronda
+        order = sorted(range(count), key=lambda agent: (
+            -self.stuck[agent],
+            self.positions[agent] == self.goals[agent],
+            (agent - self.rounds) % count,
+        ))
+        self.rounds += 1
+
+        # Con presupuesto, los agentes que no alcanzan a buscar siguen con el resto de su ventana
+        # anterior si todavía cabe, o esperan (y suben de prioridad)
+        queue = deque()
+        searches = 0
+        paths = {}
+        waiting = []
+        for agent in order:
+            if self.positions[agent] == self.goals[agent] or self.budget is None or searches < self.budget:
+                if self.positions[agent] != self.goals[agent]:
+                    searches += 1
+                queue.append(agent)
+            else:
+                waiting.append(agent)
+        for agent in waiting:
+            tail = self.tails[agent]
+            self.tails[agent] = []
+            path = tail + tail[-1:] * (self.commit - len(tail)) if tail else None
+            if path is not None and self.fits(agent, path):
+                self.reserve(agent, path)
+                paths[agent] = path
+            else:
+                queue.extend(self.stay(agent))
+                paths[agent] = None
+
+        while queue:
+            agent = queue.popleft()
+            self.searched.add(agent)
+            path = self.search(agent)
+            if path is None:
+                # Sin camino: esperar siempre es posible, y quien pasaba por aquí vuelve a buscar
+                displaced = self.stay(agent)
+                paths[agent] = None
+                self.tails[agent] = []
+                queue.extend(displaced)
+            else:
+                self.reserve(agent, path)
+                paths[agent] = path[:self.commit]
+                self.tails[agent] = path[self.commit:]
+
+        for agent, path in paths.items():
+            self.plans[agent] = deque(path or [self.positions[agent]] * self.commit)
+
+    # Avanzar un tick: replanificar si terminó la ronda y mover a todos
+    def step(self):
+        if not self.plans[0]:
+            self.plan()
+        self.tick += 1
+        for agent in range(len(self.starts)):
+            self.positions[agent] = self.plans[agent].popleft()
+            self.history[agent].append(self.positions[agent])
+        return self.positions
+
+    def done(self):
+        return self.positions == self.goals
+
+    # Simular hasta que todos lleguen (o hasta max_ticks); devuelve la celda de cada agente en cada tick
+    def run(self, max_ticks=10000):
+        while not self.done() and self.tick < max_ticks:
+            self.step()
+        return self.history
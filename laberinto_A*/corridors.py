@@ -0,0 +1,93 @@
+from collections import deque
+
+# Dirección opuesta de cada acción, para no volver atrás al recorrer un pasillo
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+
+# Rellenar callejones sin salida: celdas abiertas con un solo vecino (excepto inicio y meta)
+def fill_dead_ends(maze):
+    filled = set()
+    degree = {}
+    queue = deque()
+
+    # Solo interesa la componente conexa del inicio
+    component = maze.component(maze.start)
+    for i in range(maze.height):
+        for j in range(maze.width):
+            if maze.walls[i][j] or maze.component((i, j)) != component:
+                continue
+            degree[(i, j)] = len(maze.neighbors((i, j)))
+            if degree[(i, j)] <= 1 and (i, j) not in (maze.start, maze.goal):
+                queue.append((i, j))
+
+    while queue:
+        state = queue.popleft()
+        if state in filled:
+            continue
+        filled.add(state)
+        for _, neighbor in maze.neighbors(state):
+            if neighbor in filled:
+                continue
+            degree[neighbor] -= 1
+            if degree[neighbor] <= 1 and neighbor not in (maze.start, maze.goal):
+                queue.append(neighbor)
+
+    return filled, degree
+
+
+# Grafo reducido: solo cruces, inicio y meta, unidos por pasillos con peso (longitud)
+class ReducedGraph():
+    def __init__(self, maze):
+        self.maze = maze
+        self.endpoints = (maze.start, maze.goal)  # El relleno y los cruces dependen del inicio y la meta
+        self.filled, degree = fill_dead_ends(maze)
+        self.num_cells = len(degree)
+
+        # Los cruces son las celdas que no son pasillo de dos vecinos
+        self.junctions = set()
+        for state, d in degree.items():
+            if state in self.filled:
+                continue
+            if d != 2 or state in (maze.start, maze.goal):
+                self.junctions.add(state)
+
+        # Aristas: cruce -> lista de (primera acción, cruce destino, longitud)
+        self.edges = {}
+        for junction in self.junctions:
+            edges = []
+            for action, state in self.open_neighbors(junction):
+                end, length = self.follow(junction, action, state)
+                if end is not None and end != junction:
+                    edges.append((action, end, length))
+            self.edges[junction] = edges
+
+    def open_neighbors(self, state):
+        return [(action, s) for action, s in self.maze.neighbors(state) if s not in self.filled]
+
+    # Recorrer un pasillo desde un cruce hasta el siguiente cruce
+    def follow(self, junction, action, state, cells=None, actions=None):
+        length = 1
+        while True:
+            if actions is not None:
+                actions.append(action)
+                cells.append(state)
+            if state in self.junctions:
+                return state, length
+            back = OPPOSITE[action]
+            step = [(a, s) for a, s in self.open_neighbors(state) if a != back]
+            if not step:
+                return None, length
+            action, state = step[0]
+            length += 1
+
+    def neighbors(self, junction):
+        return self.edges[junction]
+
+    # Expandir una lista de (cruce, primera acción, cruce destino) al camino completo (acciones, celdas)
+    def expand(self, steps):
+        actions = []
+        cells = []
+        for junction, action, _ in steps:
+            state = dict(self.open_neighbors(junction))[action]
+            self.follow(junction, action, state, cells, actions)
+        return actions, cells
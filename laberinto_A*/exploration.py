@@ -0,0 +1,67 @@
+import struct
+import zlib
+from array import array
+
+# Formato del archivo de trazas: cabecera + deltas comprimidos con zlib
+MAGIC = b"TRZ1"
+HEADER = struct.Struct("<4sIII")  # magia, alto, ancho, cantidad de celdas
+
+
+# Traza de exploración: orden en que se expandieron las celdas, guardado como diferencias
+# entre ids consecutivos (fila * ancho + columna), que casi siempre son pequeñas
+class ExplorationTrace():
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.deltas = array("i")
+        self.last = 0
+        self.decoded = None
+
+    def __len__(self):
+        return len(self.deltas)
+
+    def record(self, state):
+        index = state[0] * self.width + state[1]
+        self.deltas.append(index - self.last)
+        self.last = index
+        self.decoded = None
+
+    # Para usarla como observer de SearchStats: maze.stats.subscribe(trace.observe)
+    def observe(self, event, state, stats):
+        if event == "expand":
+            self.record(state)
+
+    def clear(self):
+        self.deltas = array("i")
+        self.last = 0
+        self.decoded = None
+
+    # Celdas en orden de expansión (se decodifica una vez y se reutiliza para avanzar o retroceder)
+    def cells(self):
+        if self.decoded is None:
+            cells = []
+            index = 0
+            for delta in self.deltas:
+                index += delta
+                cells.append(divmod(index, self.width))
+            self.decoded = cells
+        return self.decoded
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.height, self.width, len(self.deltas)))
+            f.write(zlib.compress(self.deltas.tobytes()))
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        magic, height, width, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception("not an exploration trace")
+        trace = cls(height, width)
+        trace.deltas.frombytes(zlib.decompress(data[HEADER.size:]))
+        if len(trace.deltas) != count:
+            raise Exception("corrupt exploration trace")
+        trace.last = sum(trace.deltas)
+        return trace
@@ -1,6 +1,19 @@
-import pygame
+import os
 import sys
 import time
+from array import array
+
+from bitboard import Bitboard
+from bounded import ida_star, sma_star
+from compact import CompactPath
+from cooperative import CooperativePlanner
+from corridors import ReducedGraph
+from exploration import ExplorationTrace
+from instrumentation import SearchStats
+from landmarks import UNREACHABLE, Landmarks, bfs_distances
+from rectangles import RectangleGraph
+from tour import plan_tour
+from tree import TreeIndex, is_perfect
 
 # Clase Nodo para la estructura de búsqueda
 class Node():
@@ -12,12 +25,13 @@ class Node():
 
 # Clase para gestionar la frontera A*
 class AStarFrontier():
-    def __init__(self, goal):
+    def __init__(self, goal, weight=1):
         self.frontier = []
         self.goal = goal
+        self.weight = weight  # Con peso 1 + epsilon el costo queda a lo sumo (1 + epsilon) veces el óptimo
 
     def add(self, node):
-        priority = node.cost + self.heuristic(node.state, self.goal)
+        priority = node.cost + self.weight * self.heuristic(node.state, self.goal)
         self.frontier.append((priority, node))
         self.frontier.sort(key=lambda x: x[0])  # Ordenar por costo total (costo + heurística)
 
@@ -28,6 +42,17 @@ class AStarFrontier():
     def contains_state(self, state):
         return any(node.state == state for _, node in self.frontier)
 
+    # Si el estado ya está en la frontera con un costo mayor, cambiarlo por el nodo más barato
+    def improve(self, node):
+        for i, (_, other) in enumerate(self.frontier):
+            if other.state == node.state:
+                if node.cost >= other.cost:
+                    return False
+                del self.frontier[i]
+                self.add(node)
+                return True
+        return False
+
     def empty(self):
         return len(self.frontier) == 0
 
@@ -37,45 +62,165 @@ class AStarFrontier():
         else:
             return self.frontier.pop(0)[1]
 
+# Frontera Greedy: se ordena solo por la heurística, sin el costo acumulado
+class GreedyFrontier(AStarFrontier):
+    def add(self, node):
+        priority = self.heuristic(node.state, self.goal)
+        self.frontier.append((priority, node))
+        self.frontier.sort(key=lambda x: x[0])
+
+# Clase para gestionar la frontera (usaremos cola para BFS)
+class QueueFrontier():
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[0]
+            self.frontier = self.frontier[1:]
+            return node
+
+# Frontera A* con heurística ALT (landmarks y desigualdad triangular)
+class ALTFrontier(AStarFrontier):
+    def __init__(self, goal, landmarks, weight=1):
+        super().__init__(goal, weight)
+        self.landmarks = landmarks
+
+    def heuristic(self, state, goal):
+        # La cota ALT nunca es menor que Manhattan si se toma el máximo de ambas
+        return max(super().heuristic(state, goal), self.landmarks.heuristic(state, goal))
+
 # Clase para manejar el laberinto y su solución
 class Maze():
-    def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
-
-        # Validaciones de inicio y meta
-        if contents.count("A") != 1:
-            raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
-            raise Exception("maze must have exactly one goal")
-
-        # Procesar el contenido del laberinto
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Leer paredes y puntos de inicio/meta
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
+    # Si se da contents se usa ese texto en vez de leer el archivo (filename puede ser None).
+    # Si se da shared (el handle de share() en otro proceso) se usan sus paredes sin copiarlas
+    def __init__(self, filename, stats=None, contents=None, shared=None):
+        self.stats = stats
+        if stats is not None:
+            stats.start("parse")
+        self.filename = filename
+        self.shared = None
+        if shared is not None:
+            from shared import SharedGrid
+            self.shared = SharedGrid.attach(shared)
+            self.height = shared["height"]
+            self.width = shared["width"]
+            self.start = tuple(shared["start"])
+            self.goal = tuple(shared["goal"])
+            self.walls = self.shared.walls()
+        else:
+            if contents is None:
+                with open(filename) as f:
+                    contents = f.read()
+
+            # Validaciones de inicio y meta
+            if contents.count("A") != 1:
+                raise Exception("maze must have exactly one start point")
+            if contents.count("B") != 1:
+                raise Exception("maze must have exactly one goal")
+
+            # Procesar el contenido del laberinto
+            contents = contents.splitlines()
+            self.height = len(contents)
+            self.width = max(len(line) for line in contents)
+
+            # Leer paredes y puntos de inicio/meta
+            self.walls = []
+            for i in range(self.height):
+                row = []
+                for j in range(self.width):
+                    try:
+                        if contents[i][j] == "A":
+                            self.start = (i, j)
+                            row.append(False)
+                        elif contents[i][j] == "B":
+                            self.goal = (i, j)
+                            row.append(False)
+                        elif contents[i][j] == " ":
+                            row.append(False)
+                        else:
+                            row.append(True)
+                    except IndexError:
                         row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+                self.walls.append(row)
+
+        if stats is not None:
+            stats.stop()
 
         self.solution = None
         self.num_explored = 0
+        self.labels = None
+        self.landmarks = None
+        self.reduced = None
+        self.field = None
+        self.tree = None
+        self.waypoints = None
+        self.rooms = None
+        self.bits = None
+        self.trace = None
+        if self.shared is not None:
+            self.attach_indexes()
+
+    # Tomar del bloque compartido los índices que el dueño ya había calculado (solo lectura)
+    def attach_indexes(self):
+        tables = self.shared.tables()
+        if "labels" in tables:
+            self.labels = tables["labels"][0]
+            self.num_components = self.shared.handle["num_components"]
+        if "field" in tables:
+            self.field = tables["field"][0]
+        if "landmark" in tables:
+            cells = [tuple(cell) for cell in self.shared.handle["landmarks"]]
+            self.landmarks = Landmarks(self.width, cells, tables["landmark"])
+        self.shared_field = self.field
+
+    # Publicar las paredes y los índices ya calculados en memoria compartida para otros procesos;
+    # devuelve un SharedGrid: su handle se envía a los procesos y close(unlink=True) lo libera
+    def share(self):
+        from shared import SharedGrid
+        return SharedGrid.publish(self)
+
+    # Resolver muchas consultas (inicio, meta) en paralelo sobre el laberinto compartido
+    def solve_many(self, queries, method="solve_a_star", options=None, workers=None):
+        from shared import solve_many
+        return solve_many(self, queries, method, options, workers)
+
+    # Grabar el orden de expansión de las búsquedas (usa los observers de SearchStats)
+    def record_trace(self):
+        if self.stats is None:
+            self.stats = SearchStats()
+        if self.trace is None:
+            self.trace = ExplorationTrace(self.height, self.width)
+            self.stats.subscribe(self.trace.observe)
+        return self.trace
+
+    # Cambiar una celda y descartar lo precalculado que depende de las paredes
+    def set_wall(self, state, wall):
+        row, col = state
+        if self.shared is not None:
+            raise Exception("shared maze is read-only")
+        if self.walls[row][col] == wall:
+            return
+        self.walls[row][col] = wall
+        self.labels = None
+        self.landmarks = None
+        self.reduced = None
+        self.field = None
+        self.tree = None
+        self.waypoints = None
+        self.rooms = None
+        self.bits = None
 
     # Función para obtener vecinos válidos
     def neighbors(self, state):
@@ -93,24 +238,301 @@ class Maze():
                 result.append((action, (r, c)))
         return result
 
+    # Etiquetar las componentes conexas de las celdas abiertas (se calcula una sola vez)
+    def components(self):
+        if self.labels is None:
+            width = self.width
+            labels = array("i", [-1]) * (self.height * width)
+            count = 0
+            for i in range(self.height):
+                for j in range(width):
+                    if self.walls[i][j] or labels[i * width + j] != -1:
+                        continue
+                    labels[i * width + j] = count
+                    stack = [(i, j)]
+                    while stack:
+                        for _, (r, c) in self.neighbors(stack.pop()):
+                            if labels[r * width + c] == -1:
+                                labels[r * width + c] = count
+                                stack.append((r, c))
+                    count += 1
+            self.labels = labels
+            self.num_components = count
+        return self.labels
+
+    # Componente de una celda (-1 si es pared)
+    def component(self, state):
+        return self.components()[state[0] * self.width + state[1]]
+
+    def connected(self, a, b):
+        return self.component(a) == self.component(b)
+
+    # Campo de distancias BFS desde la meta (se calcula una vez para cualquier inicio)
+    def distance_field(self):
+        if self.field is None:
+            self.field = bfs_distances(self, self.goal)
+        return self.field
+
+    # Siguiente movimiento hacia la meta desde cualquier celda, o None si ya está en ella
+    def next_move(self, state):
+        field = self.distance_field()
+        distance = field[state[0] * self.width + state[1]]
+        if distance == UNREACHABLE:
+            raise Exception("no solution")
+        for action, (r, c) in self.neighbors(state):
+            if field[r * self.width + c] == distance - 1:
+                return action, (r, c)
+        return None
+
+    # Camino más corto desde cualquier celda hasta la meta, siguiendo el campo de distancias
+    def path_from(self, state):
+        actions = []
+        cells = []
+        step = self.next_move(state)
+        while step is not None:
+            actions.append(step[0])
+            cells.append(step[1])
+            step = self.next_move(step[1])
+        return actions, cells
+
+    # Filas de la grilla como bitboards (enteros), para el BFS bit-paralelo
+    def bitboard(self):
+        if self.bits is None:
+            self.bits = Bitboard(self)
+        return self.bits
+
+    # BFS bit-paralelo: cada nivel se expande fila por fila con desplazamientos y máscaras, y el
+    # camino se reconstruye con los niveles guardados. Solo usa la biblioteca estándar
+    def solve_bitboard(self):
+        self.num_explored = 0
+
+        # Si ya se calcularon las componentes se rechaza de inmediato; si no, el BFS lo detecta solo
+        if self.labels is not None and not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+        try:
+            actions, cells, self.num_explored = self.bitboard().path(self.start, self.goal)
+        finally:
+            if stats is not None:
+                stats.stop()
+        self.solution = (actions, cells)
+
+    # Índice de árbol si el laberinto es perfecto (None si tiene ciclos); se calcula una sola vez
+    def tree_index(self):
+        if self.tree is None:
+            self.tree = TreeIndex(self) if is_perfect(self) else False
+        return self.tree or None
+
+    # En un laberinto perfecto el camino es único: se arma con el índice de árbol, sin buscar
+    def solve_tree(self):
+        tree = self.tree_index()
+        if tree is None:
+            raise Exception("maze is not perfect")
+        self.solution = tree.path(self.start, self.goal)
+        self.num_explored = 0
+
+    # Distancia entre dos celdas cualesquiera de un laberinto perfecto en O(log n)
+    def tree_distance(self, a, b):
+        tree = self.tree_index()
+        if tree is None:
+            raise Exception("maze is not perfect")
+        distance = tree.distance(a, b)
+        if distance is None:
+            raise Exception("no solution")
+        return distance
+
+    # Recorrido de A a B que pasa por todos los checkpoints en el orden más corto: exacto
+    # (Held-Karp) con pocos checkpoints y aproximado con muchos. Las búsquedas desde cada
+    # checkpoint quedan en caché para los próximos recorridos. Devuelve el orden de visita
+    def solve_tour(self, checkpoints):
+        if self.waypoints is None:
+            self.waypoints = {}
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+        try:
+            order, self.solution, self.num_explored = plan_tour(self, checkpoints, self.waypoints)
+        finally:
+            if stats is not None:
+                stats.stop()
+        return order
+
+    # Varios agentes a la vez con WHCA* (A* cooperativo con ventana y tabla de reservas
+    # espacio-tiempo). agents es una lista de (inicio, meta); el planificador avanza de a un tick
+    def cooperative(self, agents, window=8, commit=None, max_expansions=None, budget=None):
+        return CooperativePlanner(self, agents, window, commit, max_expansions, budget)
+
+    # Simular a todos los agentes hasta que lleguen; devuelve la celda de cada uno en cada tick
+    def solve_agents(self, agents, window=8, max_ticks=10000, budget=None):
+        planner = self.cooperative(agents, window, budget=budget)
+        history = planner.run(max_ticks)
+        self.num_explored = planner.num_explored
+        if not planner.done():
+            raise Exception("agents did not reach their goals")
+        return history
+
+    # Preprocesamiento ALT: cargar landmarks guardados junto al laberinto o calcularlos
+    def prepare_landmarks(self, k=8):
+        if self.landmarks is None and self.filename is None:
+            self.landmarks = Landmarks.build(self, k)
+        elif self.landmarks is None:
+            filename = self.filename + ".alt"
+            self.landmarks = Landmarks.load(filename, self)
+            if self.landmarks is None:
+                self.landmarks = Landmarks.build(self, k)
+                # Si no se puede escribir junto al laberinto, las tablas quedan solo en memoria
+                try:
+                    self.landmarks.save(filename, self)
+                except OSError:
+                    pass
+        return self.landmarks
+
+    # Resolución del laberinto utilizando BFS
+    def solve(self):
+        self.search(QueueFrontier())
+
+    # Resolución del laberinto utilizando el algoritmo Greedy
+    def solve_greedy(self):
+        self.search(GreedyFrontier(self.goal))
+
     # Resolución del laberinto utilizando el algoritmo A*
-    def solve_a_star(self):
+    def solve_a_star(self, use_landmarks=False):
+        self.search(self.a_star_frontier(0, use_landmarks))
+
+    # Weighted A*: prioridad g + (1 + epsilon) h, el camino cuesta a lo sumo (1 + epsilon) veces el óptimo
+    def solve_weighted_a_star(self, epsilon=0.5, use_landmarks=False):
+        self.search(self.a_star_frontier(epsilon, use_landmarks))
+
+    # A* anytime: repite Weighted A* bajando epsilon hasta agotar el tiempo (en segundos);
+    # cada búsqueda poda lo que no mejora la solución anterior. Devuelve la cota garantizada
+    def solve_anytime(self, time_limit, epsilon=2.0, step=0.5, use_landmarks=False):
+        deadline = time.monotonic() + time_limit
+        best = None
+        bound = None
+        limit = None
+        while True:
+            try:
+                self.search(self.a_star_frontier(epsilon, use_landmarks), limit, deadline)
+                best = self.solution
+                limit = len(best[0])
+            except Exception as e:
+                if str(e) == "deadline reached":
+                    break
+                if str(e) != "no solution" or best is None:
+                    raise
+                # Nada mejor que la solución actual con este epsilon: ya cumple su cota
+            bound = 1 + epsilon
+            if epsilon == 0:
+                break
+            epsilon = max(0, epsilon - step)
+
+        if best is None:
+            raise Exception("deadline reached")
+        self.solution = best
+        return bound
+
+    # Beam search: BFS por niveles que solo conserva los width mejores nodos según la heurística
+    def solve_beam(self, width=10, use_landmarks=False):
+        self.num_explored = 0
+
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        heuristic = self.a_star_frontier(0, use_landmarks).heuristic
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
+        layer = [Node(state=self.start, parent=None, action=None, cost=0)]
+        self.explored = {self.start}
+        while layer:
+            candidates = []
+            for node in layer:
+                self.num_explored += 1
+                if stats is not None:
+                    stats.expand(node.state)
+                for action, state in self.neighbors(node.state):
+                    if state in self.explored:
+                        if stats is not None:
+                            stats.duplicate(state)
+                        continue
+                    self.explored.add(state)
+                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
+                    if stats is not None:
+                        stats.generate(state, len(candidates) + 1)
+
+                    if state == self.goal:
+                        actions = []
+                        cells = []
+                        while child.parent is not None:
+                            actions.append(child.action)
+                            cells.append(child.state)
+                            child = child.parent
+                        actions.reverse()
+                        cells.reverse()
+                        self.solution = (actions, cells)
+                        if stats is not None:
+                            stats.stop()
+                        return
+                    candidates.append(child)
+
+            candidates.sort(key=lambda node: heuristic(node.state, self.goal))
+            layer = candidates[:width]
+
+        # El haz descarta nodos, así que puede no encontrar un camino aunque exista
+        if stats is not None:
+            stats.stop()
+        raise Exception("no solution within beam width")
+
+    # Frontera A* (o ALT) con peso 1 + epsilon sobre la heurística
+    def a_star_frontier(self, epsilon=0, use_landmarks=False):
+        if use_landmarks:
+            return ALTFrontier(self.goal, self.prepare_landmarks(), 1 + epsilon)
+        return AStarFrontier(self.goal, 1 + epsilon)
+
+    # Búsqueda común a BFS, Greedy y A*: el orden de expansión lo decide la frontera.
+    # limit poda los nodos cuyo f no mejora una solución conocida; deadline corta la búsqueda
+    def search(self, frontier, limit=None, deadline=None):
         self.num_explored = 0
 
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
         start = Node(state=self.start, parent=None, action=None, cost=0)
-        frontier = AStarFrontier(self.goal)
         frontier.add(start)
+        if stats is not None:
+            stats.generate(self.start, 1)
 
         self.explored = set()
 
         while True:
             if frontier.empty():
+                if stats is not None:
+                    stats.stop()
                 raise Exception("no solution")
 
+            if deadline is not None and time.monotonic() > deadline:
+                if stats is not None:
+                    stats.stop()
+                raise Exception("deadline reached")
+
             node = frontier.remove()
             self.num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
 
             if node.state == self.goal:
+                if stats is not None:
+                    stats.start("reconstruct")
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -120,17 +542,171 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                if stats is not None:
+                    stats.stop()
                 return
 
             self.explored.add(node.state)
 
             for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
+                if state in self.explored:
+                    if stats is not None:
+                        stats.duplicate(state)
+                    continue
+
+                # Podar los nodos que no pueden mejorar una solución ya conocida
+                if limit is not None and node.cost + 1 + frontier.heuristic(state, self.goal) >= limit:
+                    continue
+
+                child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
+                if not frontier.contains_state(state):
                     frontier.add(child)
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif isinstance(frontier, AStarFrontier) and frontier.improve(child):
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif stats is not None:
+                    stats.duplicate(state)
+
+    # Preprocesamiento: rellenar callejones y comprimir pasillos en un grafo de cruces
+    def reduce(self):
+        # Se vuelve a armar si cambiaron el inicio o la meta (p. ej. en consultas de solve_many)
+        if self.reduced is None or self.reduced.endpoints != (self.start, self.goal):
+            self.reduced = ReducedGraph(self)
+        return self.reduced
+
+    # Resolución con A* sobre el grafo reducido (aristas con peso = longitud del pasillo)
+    def solve_reduced(self, use_landmarks=False):
+        self.graph_search(self.reduce, use_landmarks)
+
+    # Preprocesamiento para salas abiertas: rectángulos vacíos reducidos a su borde (RSR)
+    def rectangles(self):
+        if self.rooms is None:
+            self.rooms = RectangleGraph(self)
+        return self.rooms
+
+    # Resolución con A* sobre el mapa RSR: solo celdas del borde y macro-aristas que cruzan cada rectángulo
+    def solve_rsr(self, use_landmarks=False):
+        self.graph_search(lambda: self.rectangles().connect(self.start, self.goal), use_landmarks)
+
+    # A* sobre un grafo con pesos que devuelve build (neighbors da (acción, estado, longitud)
+    # y expand convierte los pasos (estado, acción, siguiente) en el camino completo)
+    def graph_search(self, build, use_landmarks=False):
+        self.num_explored = 0
+
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        graph = build()
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
+        start = Node(state=self.start, parent=None, action=None, cost=0)
+        frontier = self.a_star_frontier(0, use_landmarks)
+        frontier.add(start)
+        if stats is not None:
+            stats.generate(self.start, 1)
+
+        self.explored = set()
+        best = {self.start: 0}
+
+        while True:
+            if frontier.empty():
+                if stats is not None:
+                    stats.stop()
+                raise Exception("no solution")
+
+            node = frontier.remove()
+            if node.state in self.explored:
+                continue
+            self.num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
+
+            if node.state == self.goal:
+                if stats is not None:
+                    stats.start("reconstruct")
+                steps = []
+                while node.parent is not None:
+                    steps.append((node.parent.state, node.action, node.state))
+                    node = node.parent
+                steps.reverse()
+                self.solution = graph.expand(steps)
+                if stats is not None:
+                    stats.stop()
+                return
+
+            self.explored.add(node.state)
+
+            # Con pesos distintos un cruce puede mejorar su costo: se reinserta en la frontera
+            for action, state, length in graph.neighbors(node.state):
+                cost = node.cost + length
+                if state not in self.explored and cost < best.get(state, cost + 1):
+                    best[state] = cost
+                    child = Node(state=state, parent=node, action=action, cost=cost)
+                    frontier.add(child)
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif stats is not None:
+                    stats.duplicate(state)
+
+    # IDA*: memoria acotada por el camino actual y una tabla de transposición de tamaño máximo
+    def solve_ida_star(self, max_table=100000, use_landmarks=False):
+        self.bounded_search(ida_star, max_table, use_landmarks)
+
+    # SMA*: A* que nunca guarda más de max_nodes nodos en memoria
+    def solve_sma_star(self, max_nodes=10000, use_landmarks=False):
+        self.bounded_search(sma_star, max_nodes, use_landmarks)
+
+    def bounded_search(self, algorithm, limit, use_landmarks):
+        self.num_explored = 0
+
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        frontier = self.a_star_frontier(0, use_landmarks)
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+        try:
+            actions, cells, self.num_explored = algorithm(self, frontier.heuristic, limit)
+        finally:
+            if stats is not None:
+                stats.stop()
+        self.solution = (actions, cells)
+
+    # Portafolio: correr varios algoritmos en procesos paralelos y quedarse con el primero
+    # que termine (con optimal=True solo los que garantizan el camino más corto)
+    def solve_portfolio(self, optimal=False, timeout=None):
+        self.num_explored = 0
+
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        # Importación diferida: multiprocessing solo se carga si se usa el portafolio
+        from portfolio import race
+        method, self.solution, self.num_explored = race(self, optimal, timeout=timeout)
+        return method
+
+    # Solución compacta (tramos rectos de 2 bits + largo) para guardarla o enviarla entre procesos
+    def compact_solution(self):
+        if self.solution is None:
+            raise Exception("no solution")
+        if isinstance(self.solution, CompactPath):
+            return self.solution
+        return CompactPath.encode(self.start, self.solution[0])
 
     # Imprimir el laberinto y la solución
     def print(self):
+        if self.stats is not None:
+            self.stats.start("render")
         solution = self.solution[1] if self.solution is not None else None
         for i, row in enumerate(self.walls):
             for j, col in enumerate(row):
@@ -145,9 +721,15 @@ class Maze():
                 else:
                     print(" ", end="")
             print()
+        if self.stats is not None:
+            self.stats.stop()
 
 # Dibujar el laberinto y la solución en Pygame
-def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
+def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img, explored=()):
+    import pygame
+
+    if maze.stats is not None:
+        maze.stats.start("render")
     CELL_SIZE = 40
     ROWS = maze.height
     COLS = maze.width
@@ -161,6 +743,10 @@ def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
                 # Color del fondo blanco
                 pygame.draw.rect(screen, (255, 255, 255), (j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE))
 
+    # Dibujar las celdas exploradas (reproducción de la traza)
+    for (row, col) in explored:
+        pygame.draw.rect(screen, (170, 210, 255), (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
     # Dibujar el camino
     for (row, col) in path:
         pygame.draw.rect(screen, (255, 255, 0), (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
@@ -170,21 +756,31 @@ def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
 
     # Dibujar meta (toro)
     screen.blit(bull_img, (maze.goal[1] * CELL_SIZE, maze.goal[0] * CELL_SIZE))
+    if maze.stats is not None:
+        maze.stats.stop()
 
 # Dibujar botones
 def draw_button(screen, text, rect, color):
+    import pygame
+
     pygame.draw.rect(screen, color, rect)
     font = pygame.font.Font(None, 36)
     text_surf = font.render(text, True, (255, 255, 255))
     text_rect = text_surf.get_rect(center=rect.center)
     screen.blit(text_surf, text_rect)
 
-# Inicializar Pygame
-def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python laberinto.py laberinto.txt")
+# Resolver sin interfaz gráfica (no se importa pygame)
+def run_headless(m):
+    m.solve_a_star()
+    print("Estados explorados:", m.num_explored)
+    print("Solución:")
+    m.print()
 
-    m = Maze(sys.argv[1])
+# Inicializar Pygame. Si se da una traza, se reproduce sin resolver el laberinto.
+# Reproducción (fuera del modo manual): espacio inicia/pausa, izquierda/derecha retroceden o
+# avanzan, arriba/abajo cambian la velocidad, Inicio/Fin saltan a los extremos y S guarda la traza
+def run_gui(m, trace=None):
+    import pygame
 
     pygame.init()
     CELL_SIZE = 40
@@ -200,6 +796,12 @@ def main():
     game_start_time = None
     elapsed_time = 0
 
+    recorder = m.record_trace()
+    replay_pos = 0
+    replay_speed = 50.0  # Celdas por segundo
+    playing = trace is not None
+    last_frame = time.time()
+
     button_bfs = pygame.Rect(10, HEIGHT - 80, 160, 50)
     button_greedy = pygame.Rect(180, HEIGHT - 80, 160, 50)
     button_a_star = pygame.Rect(350, HEIGHT - 80, 160, 50)
@@ -230,26 +832,38 @@ def main():
                 # Acción del botón "BFS"
                 if button_bfs.collidepoint(mouse_pos):
                     if not show_solution:
+                        recorder.clear()
                         m.solve()  # BFS
                         path = m.solution[1]
                         show_solution = True
                         manual_mode = False
+                        trace = recorder
+                        replay_pos = len(trace)
+                        playing = False
 
                 # Acción del botón "Greedy"
                 if button_greedy.collidepoint(mouse_pos):
                     if not show_solution:
+                        recorder.clear()
                         m.solve_greedy()
                         path = m.solution[1]
                         show_solution = True
                         manual_mode = False
+                        trace = recorder
+                        replay_pos = len(trace)
+                        playing = False
 
                 # Acción del botón "A*"
                 if button_a_star.collidepoint(mouse_pos):
                     if not show_solution:
+                        recorder.clear()
                         m.solve_a_star()  # A*
                         path = m.solution[1]
                         show_solution = True
                         manual_mode = False
+                        trace = recorder
+                        replay_pos = len(trace)
+                        playing = False
 
                 # Acción del botón "Manual"
                 if button_manual.collidepoint(mouse_pos):
@@ -266,6 +880,8 @@ def main():
                     manual_mode = False
                     elapsed_time = 0
                     m.num_explored = 0
+                    trace = None
+                    playing = False
 
             if manual_mode and event.type == pygame.KEYDOWN:
                 row, col = player_pos
@@ -278,14 +894,51 @@ def main():
                 if event.key == pygame.K_RIGHT and col < m.width - 1 and not m.walls[row][col + 1]:
                     player_pos = (row, col + 1)
 
+                # Pista: camino más corto desde la posición actual
+                if event.key == pygame.K_h:
+                    path = m.path_from(player_pos)[1]
+
                 # Si llega a la meta, detener el contador
                 if player_pos == m.goal:
                     elapsed_time = time.time() - game_start_time
                     manual_mode = False
 
+            # Controles de la reproducción de la traza
+            elif trace is not None and event.type == pygame.KEYDOWN:
+                step = max(1, int(replay_speed / 10))
+                if event.key == pygame.K_SPACE:
+                    if replay_pos >= len(trace):
+                        replay_pos = 0
+                    playing = not playing
+                if event.key == pygame.K_LEFT:
+                    replay_pos = max(0, int(replay_pos) - step)
+                    playing = False
+                if event.key == pygame.K_RIGHT:
+                    replay_pos = min(len(trace), int(replay_pos) + step)
+                    playing = False
+                if event.key == pygame.K_UP:
+                    replay_speed *= 2
+                if event.key == pygame.K_DOWN:
+                    replay_speed = max(1.0, replay_speed / 2)
+                if event.key == pygame.K_HOME:
+                    replay_pos = 0
+                if event.key == pygame.K_END:
+                    replay_pos = len(trace)
+                if event.key == pygame.K_s and m.filename is not None:
+                    trace.save(m.filename + ".trace")
+
+        # Avanzar la reproducción según el tiempo transcurrido
+        now = time.time()
+        if playing:
+            replay_pos = min(len(trace), replay_pos + (now - last_frame) * replay_speed)
+            if replay_pos >= len(trace):
+                playing = False
+        last_frame = now
+        explored = trace.cells()[:int(replay_pos)] if trace is not None else ()
+
         # Dibujar laberinto
         screen.fill((255, 255, 255))
-        draw_maze(screen, m, path, player_pos, wall_img, person_img, bull_img)
+        draw_maze(screen, m, path, player_pos, wall_img, person_img, bull_img, explored)
 
         # Dibujar botones
         draw_button(screen, "Auto. A*", button_a_star, (255, 0, 128))
@@ -296,6 +949,11 @@ def main():
         explored_text = font.render(f"Explorados: {m.num_explored}", True, (0, 0, 0))
         screen.blit(explored_text, (WIDTH - 250, HEIGHT - 80))
 
+        # Mostrar la posición de la reproducción
+        if trace is not None:
+            trace_text = font.render(f"Traza: {int(replay_pos)}/{len(trace)}", True, (0, 0, 0))
+            screen.blit(trace_text, (WIDTH - 250, HEIGHT - 20))
+
         # Mostrar el tiempo en modo manual
         if manual_mode and game_start_time:
             current_time = time.time() - game_start_time
@@ -309,6 +967,38 @@ def main():
 
     pygame.quit()
 
+# Punto de entrada: interfaz gráfica, o solo la solución en texto con --headless.
+# Con --replay archivo.trace se reproduce una exploración guardada sin volver a resolver
+def main():
+    args = sys.argv[1:]
+    headless = "--headless" in args
+    if headless:
+        args.remove("--headless")
+    replay = None
+    if "--replay" in args:
+        i = args.index("--replay")
+        replay = args[i + 1] if i + 1 < len(args) else ""
+        del args[i:i + 2]
+    if len(args) != 1 or replay == "":
+        sys.exit("Usage: python laberinto.py laberinto.txt [--headless | --replay archivo.trace]")
+
+    # LABERINTO_STATS=archivo.json activa la instrumentación y la exporta al salir
+    stats_file = os.environ.get("LABERINTO_STATS")
+    m = Maze(args[0], SearchStats() if stats_file else None)
+
+    if headless:
+        run_headless(m)
+    elif replay is not None:
+        trace = ExplorationTrace.load(replay)
+        if (trace.height, trace.width) != (m.height, m.width):
+            sys.exit("trace does not match the maze")
+        run_gui(m, trace)
+    else:
+        run_gui(m)
+
+    if stats_file:
+        m.stats.to_json(stats_file)
+
 
 if __name__ == "__main__":
     main()
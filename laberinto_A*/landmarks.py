@@ -0,0 +1,126 @@
+import struct
+import zlib
+from array import array
+from collections import deque
+
+# Formato del archivo de landmarks: cabecera + celdas + tablas de distancias
+MAGIC = b"ALT1"
+HEADER = struct.Struct("<4sIIII")  # magia, alto, ancho, número de landmarks, crc de paredes
+UNREACHABLE = -1
+
+
+# Huella de las paredes para detectar archivos desactualizados
+def walls_checksum(walls):
+    bits = bytes(1 if cell else 0 for row in walls for cell in row)
+    return zlib.crc32(bits)
+
+
+# Distancias BFS desde una celda a todas las demás, en un arreglo plano (fila * ancho + columna)
+def bfs_distances(maze, source):
+    width = maze.width
+    dist = array("i", [UNREACHABLE]) * (maze.height * width)
+    dist[source[0] * width + source[1]] = 0
+    queue = deque([source])
+    while queue:
+        state = queue.popleft()
+        d = dist[state[0] * width + state[1]] + 1
+        for _, (r, c) in maze.neighbors(state):
+            index = r * width + c
+            if dist[index] == UNREACHABLE:
+                dist[index] = d
+                queue.append((r, c))
+    return dist
+
+
+# Clase con las tablas de distancias a cada landmark (heurística ALT)
+class Landmarks():
+    def __init__(self, width, cells, tables):
+        self.width = width
+        self.cells = cells
+        self.tables = tables
+
+    # Elegir k landmarks por el método del punto más lejano
+    @classmethod
+    def build(cls, maze, k=8):
+        width = maze.width
+        cells = []
+        tables = []
+
+        # El primer landmark es la celda más lejana al inicio
+        coverage = bfs_distances(maze, maze.start)
+        while len(cells) < k:
+            best = max(range(len(coverage)), key=coverage.__getitem__)
+            if coverage[best] <= 0:
+                break
+            cell = divmod(best, width)
+            table = bfs_distances(maze, cell)
+            cells.append(cell)
+            tables.append(table)
+
+            # Distancia mínima de cada celda a los landmarks ya elegidos
+            for i, d in enumerate(table):
+                if d < coverage[i]:
+                    coverage[i] = d
+
+        return cls(width, cells, tables)
+
+    # Cota inferior por desigualdad triangular: |d(L, meta) - d(L, estado)|
+    def heuristic(self, state, goal):
+        s = state[0] * self.width + state[1]
+        g = goal[0] * self.width + goal[1]
+        best = 0
+        for table in self.tables:
+            ds = table[s]
+            dg = table[g]
+            if ds == UNREACHABLE or dg == UNREACHABLE:
+                continue
+            if ds > dg:
+                bound = ds - dg
+            else:
+                bound = dg - ds
+            if bound > best:
+                best = bound
+        return best
+
+    # Guardar las tablas junto al laberinto
+    def save(self, filename, maze):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, maze.height, maze.width, len(self.cells), walls_checksum(maze.walls)))
+            f.write(array("i", [x for cell in self.cells for x in cell]).tobytes())
+            for table in self.tables:
+                f.write(table.tobytes())
+
+    # Cargar las tablas; devuelve None si el archivo no corresponde al laberinto
+    @classmethod
+    def load(cls, filename, maze):
+        try:
+            with open(filename, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+        magic, height, width, k, checksum = HEADER.unpack_from(data)
+        if magic != MAGIC or (height, width) != (maze.height, maze.width) or checksum != walls_checksum(maze.walls):
+            return None
+
+        size = height * width
+        itemsize = array("i").itemsize
+        if len(data) != HEADER.size + (2 * k + k * size) * itemsize:
+            return None
+
+        offset = HEADER.size
+        coords = array("i")
+        coords.frombytes(data[offset:offset + 2 * k * itemsize])
+        offset += 2 * k * itemsize
+        cells = [(coords[2 * i], coords[2 * i + 1]) for i in range(k)]
+
+        tables = []
+        for _ in range(k):
+            table = array("i")
+            table.frombytes(data[offset:offset + size * itemsize])
+            offset += size * itemsize
+            tables.append(table)
+
+        return cls(width, cells, tables)
@@ -0,0 +1,86 @@
+import multiprocessing
+import time
+from multiprocessing.connection import wait
+
+# Algoritmos del portafolio y si garantizan el camino óptimo
+SOLVERS = {
+    "solve": True,
+    "solve_bitboard": True,
+    "solve_a_star": True,
+    "solve_reduced": True,
+    "solve_rsr": True,
+    "solve_tree": True,
+    "solve_greedy": False,
+}
+
+
+# Trabajo de cada proceso: resolver con un algoritmo y enviar el resultado
+def run(maze, method, results):
+    try:
+        getattr(maze, method)()
+        # La solución viaja compacta y se decodifica en el proceso principal solo si se usa
+        results.send((method, maze.compact_solution(), maze.num_explored))
+    except Exception as e:
+        results.send((method, None, str(e)))
+
+
+# Con "fork" los procesos heredan el laberinto ya cargado sin copiarlo ni serializarlo
+def context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+# Lanzar varios algoritmos a la vez y quedarse con el primero que cumpla la garantía pedida
+def race(maze, optimal=False, methods=None, timeout=None):
+    if methods is None:
+        methods = list(SOLVERS)
+    methods = [method for method in methods if SOLVERS[method] or not optimal]
+    if not methods:
+        raise Exception("no solver satisfies the requested guarantee")
+
+    # Un canal por proceso: se espera a la vez en los canales y en los procesos, así un
+    # proceso que muere sin responder (p. ej. por falta de memoria) cuenta como una falla
+    ctx = context()
+    workers = []
+    pending = {}
+    for method in methods:
+        reader, writer = ctx.Pipe(duplex=False)
+        worker = ctx.Process(target=run, args=(maze, method, writer), daemon=True)
+        worker.start()
+        writer.close()
+        workers.append(worker)
+        pending[reader] = pending[worker.sentinel] = (reader, worker, method)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors = []
+    try:
+        while pending:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready = wait(list(pending), timeout=remaining)
+            if not ready:
+                raise Exception("portfolio timed out")
+            for key in ready:
+                if key not in pending:
+                    continue
+                reader, worker, method = pending[key]
+                # Si el proceso terminó sin escribir, el canal ya está cerrado y recv no bloquea
+                try:
+                    _, solution, info = reader.recv()
+                except EOFError:
+                    worker.join(1)
+                    solution, info = None, f"{method}: process exited with code {worker.exitcode}"
+                del pending[reader], pending[worker.sentinel]
+                reader.close()
+                if solution is not None:
+                    return method, solution, info
+                errors.append(info)
+    finally:
+        # Cancelar el resto de los procesos
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    raise Exception(errors[0])
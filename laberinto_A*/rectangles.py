@@ -0,0 +1,121 @@
+from corridors import OPPOSITE
+
+
+# Partir las celdas libres en rectángulos vacíos: desde la primera celda libre sin asignar
+# (en orden de filas) se extiende hacia la derecha todo lo posible y luego hacia abajo
+def decompose(maze):
+    owner = [[-1] * maze.width for _ in range(maze.height)]
+    rectangles = []
+    for i in range(maze.height):
+        for j in range(maze.width):
+            if maze.walls[i][j] or owner[i][j] != -1:
+                continue
+            right = j
+            while right + 1 < maze.width and not maze.walls[i][right + 1] and owner[i][right + 1] == -1:
+                right += 1
+            bottom = i
+            while bottom + 1 < maze.height and all(
+                not maze.walls[bottom + 1][c] and owner[bottom + 1][c] == -1 for c in range(j, right + 1)
+            ):
+                bottom += 1
+            for r in range(i, bottom + 1):
+                for c in range(j, right + 1):
+                    owner[r][c] = len(rectangles)
+            rectangles.append((i, j, bottom, right))
+    return rectangles, owner
+
+
+# Rectangular Symmetry Reduction: de cada rectángulo solo quedan las celdas del borde; las del
+# interior se reemplazan por macro-aristas rectas que cruzan al lado opuesto. En grillas de 4
+# vecinos se conservan los caminos óptimos (costo de arista = celdas recorridas)
+class RectangleGraph():
+    def __init__(self, maze):
+        self.maze = maze
+        self.rectangles, self.owner = decompose(maze)
+        self.extra = {}
+
+        # Aristas: celda del borde -> lista de (acción, celda destino, longitud)
+        self.edges = {}
+        for i in range(maze.height):
+            for j in range(maze.width):
+                if maze.walls[i][j] or self.interior((i, j)):
+                    continue
+                top, left, bottom, right = self.rectangles[self.owner[i][j]]
+                edges = []
+                for action, (r, c) in maze.neighbors((i, j)):
+                    if not self.interior((r, c)):
+                        edges.append((action, (r, c), 1))
+                    elif r != i:
+                        end = (bottom if r > i else top, j)
+                        edges.append((action, end, abs(end[0] - i)))
+                    else:
+                        end = (i, right if c > j else left)
+                        edges.append((action, end, abs(end[1] - j)))
+                self.edges[(i, j)] = edges
+
+        self.num_nodes = len(self.edges)
+
+    def interior(self, state):
+        row, col = state
+        top, left, bottom, right = self.rectangles[self.owner[row][col]]
+        return top < row < bottom and left < col < right
+
+    # Celdas del borde a las que se llega en línea recta desde una celda interior
+    def ports(self, state):
+        row, col = state
+        top, left, bottom, right = self.rectangles[self.owner[row][col]]
+        return [
+            ("up", (top, col), row - top),
+            ("down", (bottom, col), bottom - row),
+            ("left", (row, left), col - left),
+            ("right", (row, right), right - col),
+        ]
+
+    # Conectar el inicio y la meta de esta consulta si quedaron en el interior de un rectángulo
+    def connect(self, start, goal):
+        self.extra = {}
+        if self.owner[start[0]][start[1]] == self.owner[goal[0]][goal[1]]:
+            # Mismo rectángulo: el camino en L es óptimo (ninguno puede ser más corto que Manhattan)
+            action = first_action(start, goal)
+            if action is not None:
+                length = abs(goal[0] - start[0]) + abs(goal[1] - start[1])
+                self.extra.setdefault(start, []).append((action, goal, length))
+        if self.interior(start):
+            self.extra.setdefault(start, []).extend(self.ports(start))
+        if self.interior(goal):
+            for action, port, length in self.ports(goal):
+                self.extra.setdefault(port, []).append((OPPOSITE[action], goal, length))
+        return self
+
+    def neighbors(self, state):
+        extra = self.extra.get(state)
+        if extra is None:
+            return self.edges.get(state, [])
+        return self.edges.get(state, []) + extra
+
+    # Expandir una lista de (celda, acción, destino) al camino completo (acciones, celdas).
+    # Cada arista queda dentro de un rectángulo vacío: se mueve primero en vertical y luego en horizontal
+    def expand(self, steps):
+        actions = []
+        cells = []
+        for (row, col), _, (r, c) in steps:
+            while row != r:
+                action = "down" if r > row else "up"
+                row += 1 if r > row else -1
+                actions.append(action)
+                cells.append((row, col))
+            while col != c:
+                action = "right" if c > col else "left"
+                col += 1 if c > col else -1
+                actions.append(action)
+                cells.append((row, col))
+        return actions, cells
+
+
+# Primera acción de un camino que va primero en vertical y después en horizontal
+def first_action(start, goal):
+    if goal[0] != start[0]:
+        return "down" if goal[0] > start[0] else "up"
+    if goal[1] != start[1]:
+        return "right" if goal[1] > start[1] else "left"
+    return None
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from laberinto import Maze
+
+# Algoritmos que se pueden pedir al servicio
+ALGORITHMS = {
+    "solve",
+    "solve_bitboard",
+    "solve_greedy",
+    "solve_a_star",
+    "solve_reduced",
+    "solve_rsr",
+    "solve_weighted_a_star",
+    "solve_anytime",
+    "solve_beam",
+    "solve_ida_star",
+    "solve_sma_star",
+    "solve_tree",
+    "solve_tour",
+}
+
+# Laberintos ya cargados en cada proceso, con su preprocesamiento (landmarks, grafo reducido...)
+CACHE_SIZE = 128
+MAZES = OrderedDict()
+
+# Laberintos registrados en el servicio (los menos usados se descartan)
+REGISTRY_SIZE = 4096
+
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 422: "Unprocessable Entity"}
+
+
+def maze_id(contents):
+    return hashlib.sha1(contents.encode()).hexdigest()[:16]
+
+
+# Trabajo de cada proceso: resolver un lote de pedidos reutilizando los laberintos en caché.
+# El texto de cada laberinto viaja una sola vez por lote y solo se procesa si no está en caché.
+# Con encoding "rle" el camino se devuelve compacto (base64 de CompactPath) en vez de listas
+def solve_batch(mazes, jobs):
+    results = []
+    for key, algorithm, options, encoding in jobs:
+        try:
+            maze = MAZES.get(key)
+            if maze is None:
+                maze = Maze(None, contents=mazes[key])
+                MAZES[key] = maze
+                if len(MAZES) > CACHE_SIZE:
+                    MAZES.popitem(last=False)
+            else:
+                MAZES.move_to_end(key)
+
+            getattr(maze, algorithm)(**options)
+            if encoding == "rle":
+                results.append({"path": maze.compact_solution().to_text(), "num_explored": maze.num_explored})
+            else:
+                actions, cells = maze.solution
+                results.append({"actions": actions, "cells": cells, "num_explored": maze.num_explored})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+# Los procesos del pool arrancan recién con el primer lote, ya con conexiones abiertas: con
+# "fork" heredarían esos sockets y el cliente no vería el cierre. Con "forkserver" (o "spawn")
+# nacen limpios
+def context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+# Servicio: agrupa los pedidos concurrentes en lotes y los reparte en un pool de procesos
+class SolveService():
+    def __init__(self, workers=None, batch_size=64, batch_delay=0.002):
+        self.pool = ProcessPoolExecutor(workers, mp_context=context())
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.mazes = OrderedDict()  # id -> texto del laberinto, en orden de uso
+        self.pending = []
+        self.timer = None
+
+    # Guardar un laberinto y devolver su id; se valida una sola vez al registrarlo
+    def register(self, contents):
+        key = maze_id(contents)
+        if self.lookup(key) is None:
+            Maze(None, contents=contents)
+            self.mazes[key] = contents
+            if len(self.mazes) > REGISTRY_SIZE:
+                self.mazes.popitem(last=False)
+        return key
+
+    # Texto de un laberinto registrado (None si no existe o ya se descartó)
+    def lookup(self, key):
+        contents = self.mazes.get(key)
+        if contents is not None:
+            self.mazes.move_to_end(key)
+        return contents
+
+    async def solve(self, key, algorithm, options, encoding="lists"):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # El texto viaja con el pedido: el laberinto puede descartarse antes de que salga el lote
+        contents = self.lookup(key)
+        self.pending.append(((key, algorithm, options, encoding), contents, future))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.batch_delay, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        batch = self.pending
+        self.pending = []
+
+        # Los pedidos del mismo laberinto van al mismo lote para aprovechar la caché del proceso
+        batch.sort(key=lambda item: item[0][0])
+        jobs = [job for job, _, _ in batch]
+        futures = [future for _, _, future in batch]
+        mazes = {job[0]: contents for job, contents, _ in batch}
+        done = asyncio.get_running_loop().run_in_executor(self.pool, solve_batch, mazes, jobs)
+        done.add_done_callback(lambda task: self.deliver(task, futures))
+
+    def deliver(self, task, futures):
+        if task.exception() is not None:
+            results = [{"error": str(task.exception())}] * len(futures)
+        else:
+            results = task.result()
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    # Atender un pedido HTTP ya leído; devuelve (código, cuerpo JSON)
+    async def handle(self, method, path, body):
+        if method != "POST" or path not in ("/mazes", "/solve"):
+            return 404, {"error": "not found"}
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "invalid JSON"}
+        if not isinstance(request, dict):
+            return 400, {"error": "request must be an object"}
+
+        try:
+            if "maze" in request:
+                key = self.register(request["maze"])
+            elif path == "/mazes":
+                return 400, {"error": "missing maze"}
+        except Exception as e:
+            return 400, {"error": str(e)}
+        if path == "/mazes":
+            return 200, {"id": key}
+
+        if "maze" not in request:
+            key = request.get("id")
+            if not isinstance(key, str) or self.lookup(key) is None:
+                return 404, {"error": "unknown maze id"}
+
+        algorithm = request.get("algorithm", "solve_a_star")
+        if algorithm not in ALGORITHMS:
+            return 400, {"error": "unknown algorithm"}
+        options = request.get("options", {})
+        if not isinstance(options, dict):
+            return 400, {"error": "options must be an object"}
+        encoding = request.get("encoding", "lists")
+        if encoding not in ("lists", "rle"):
+            return 400, {"error": "unknown encoding"}
+
+        result = await self.solve(key, algorithm, options, encoding)
+        return (422 if "error" in result else 200), result
+
+    # Conexión HTTP/1.1 con keep-alive
+    async def connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, _ = line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, response = await self.handle(method, path, body)
+                data = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    service = SolveService(args.workers, args.batch_size, args.batch_delay)
+    if args.unix:
+        server = await asyncio.start_unix_server(service.connection, args.unix)
+    else:
+        server = await asyncio.start_server(service.connection, args.host, args.port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local para resolver laberintos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="escuchar en un socket Unix en vez de TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-delay", type=float, default=0.002)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+from array import array
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+ITEMSIZE = array("i").itemsize
+
+
+# Paredes e índices de un laberinto publicados en memoria compartida: un solo bloque con las
+# paredes (un byte por celda) y, si ya están calculados, las componentes, el campo de distancias
+# a la meta y las tablas de landmarks (int32 por celda). Los otros procesos solo reciben el handle
+class SharedGrid():
+    def __init__(self, memory, handle):
+        self.memory = memory
+        self.handle = handle
+        self.views = []
+
+    # Copiar el laberinto al bloque compartido (una sola vez, en el proceso dueño)
+    @classmethod
+    def publish(cls, maze):
+        size = maze.height * maze.width
+        walls_size = (size + ITEMSIZE - 1) // ITEMSIZE * ITEMSIZE  # Alinear los int32 que siguen
+        tables = []
+        if maze.labels is not None:
+            tables.append(("labels", maze.labels))
+        if maze.field is not None:
+            tables.append(("field", maze.field))
+        if maze.landmarks is not None:
+            tables.extend(("landmark", table) for table in maze.landmarks.tables)
+
+        memory = shared_memory.SharedMemory(create=True, size=walls_size + len(tables) * size * ITEMSIZE)
+        memory.buf[:size] = bytes(1 if cell else 0 for row in maze.walls for cell in row)
+        layout = []
+        offset = walls_size
+        for key, table in tables:
+            memory.buf[offset:offset + size * ITEMSIZE] = table.tobytes()
+            layout.append((key, offset))
+            offset += size * ITEMSIZE
+
+        handle = {
+            "name": memory.name,
+            "height": maze.height,
+            "width": maze.width,
+            "start": maze.start,
+            "goal": maze.goal,
+            "layout": layout,
+            "num_components": getattr(maze, "num_components", None),
+            "landmarks": maze.landmarks.cells if maze.landmarks is not None else None,
+        }
+        return cls(memory, handle)
+
+    # Conectarse a un bloque publicado por otro proceso, sin copiar nada
+    @classmethod
+    def attach(cls, handle):
+        return cls(shared_memory.SharedMemory(name=handle["name"]), handle)
+
+    # Vistas de solo lectura sobre el bloque: una por fila de paredes y una por tabla
+    def walls(self):
+        height, width = self.handle["height"], self.handle["width"]
+        data = self.memory.buf.toreadonly()
+        rows = [data[i * width:(i + 1) * width] for i in range(height)]
+        self.views.append(data)
+        self.views.extend(rows)
+        return rows
+
+    def tables(self):
+        size = self.handle["height"] * self.handle["width"]
+        result = {}
+        for key, offset in self.handle["layout"]:
+            view = self.memory.buf[offset:offset + size * ITEMSIZE].toreadonly().cast("i")
+            self.views.append(view)
+            result.setdefault(key, []).append(view)
+        return result
+
+    # Cerrar el bloque; el dueño además lo elimina del sistema
+    def close(self, unlink=False):
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+# Laberinto adjunto en cada proceso del pool
+WORKER_MAZE = None
+
+
+def attach_worker(handle):
+    global WORKER_MAZE
+    from laberinto import Maze
+    WORKER_MAZE = Maze(None, shared=handle)
+
+
+# Resolver una consulta (inicio, meta) sobre el laberinto compartido
+def solve_query(method, options, query):
+    maze = WORKER_MAZE
+    maze.start, maze.goal = query
+    # El campo publicado solo vale para la meta original
+    maze.field = maze.shared_field if maze.goal == maze.shared.handle["goal"] else None
+    try:
+        getattr(maze, method)(**options)
+        actions, cells = maze.solution
+        return {"actions": actions, "cells": cells, "num_explored": maze.num_explored}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Resolver muchas consultas sobre un mismo laberinto en paralelo. El laberinto se publica una
+# vez en memoria compartida y cada proceso se adjunta al arrancar: solo viajan las consultas
+def solve_many(maze, queries, method="solve_a_star", options=None, workers=None):
+    if options is None:
+        options = {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    queries = [(tuple(start), tuple(goal)) for start, goal in queries]
+
+    maze.components()
+    grid = SharedGrid.publish(maze)
+    try:
+        with ProcessPoolExecutor(workers, initializer=attach_worker, initargs=(grid.handle,)) as pool:
+            chunksize = max(1, len(queries) // (4 * workers))
+            return list(pool.map(solve_query, repeat(method), repeat(options), queries, chunksize=chunksize))
+    finally:
+        grid.close(unlink=True)
@@ -0,0 +1,179 @@
+from array import array
+from collections import deque
+
+ACTIONS = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+UNVISITED = -1
+HELD_KARP_LIMIT = 12  # Hasta cuántos checkpoints se busca el orden exacto
+CACHE_SIZE = 64  # Búsquedas guardadas por laberinto (cada una ocupa dos arreglos del tamaño de la grilla)
+INFINITY = float("inf")
+
+
+# BFS desde una celda hacia varias metas a la vez: se detiene apenas las alcanza todas y se
+# puede retomar si después se piden otras (guarda distancias, padres y la cola)
+class WaypointSearch():
+    def __init__(self, maze, source):
+        self.maze = maze
+        self.width = maze.width
+        size = maze.height * maze.width
+        index = source[0] * self.width + source[1]
+        self.source = index
+        self.distances = array("i", [UNVISITED]) * size
+        self.parents = array("i", [UNVISITED]) * size
+        self.distances[index] = 0
+        self.parents[index] = index
+        self.queue = deque([index])
+
+    # Continuar el BFS hasta alcanzar todas las metas; devuelve cuántos estados expandió
+    def reach(self, targets):
+        width = self.width
+        distances = self.distances
+        parents = self.parents
+        queue = self.queue
+        stats = self.maze.stats
+        pending = {r * width + c for r, c in targets}
+        pending = {index for index in pending if distances[index] == UNVISITED}
+        num_explored = 0
+        while pending and queue:
+            index = queue.popleft()
+            num_explored += 1
+            state = divmod(index, width)
+            if stats is not None:
+                stats.expand(state)
+            d = distances[index] + 1
+            for _, (r, c) in self.maze.neighbors(state):
+                neighbor = r * width + c
+                if distances[neighbor] == UNVISITED:
+                    distances[neighbor] = d
+                    parents[neighbor] = index
+                    queue.append(neighbor)
+                    pending.discard(neighbor)
+        return num_explored
+
+    def distance(self, target):
+        d = self.distances[target[0] * self.width + target[1]]
+        return None if d == UNVISITED else d
+
+    # Camino desde la celda de origen hasta target, siguiendo los padres hacia atrás
+    def path(self, target):
+        width = self.width
+        index = target[0] * width + target[1]
+        steps = []
+        while index != self.source:
+            steps.append(index)
+            index = self.parents[index]
+        steps.reverse()
+
+        actions = []
+        cells = []
+        row, col = divmod(self.source, width)
+        for index in steps:
+            r, c = divmod(index, width)
+            actions.append(ACTIONS[(r - row, c - col)])
+            cells.append((r, c))
+            row, col = r, c
+        return actions, cells
+
+
+# Orden exacto (Held-Karp): dist es la matriz entre inicio (0), checkpoints y meta (último);
+# best[mask][j] es el costo mínimo de salir del inicio, visitar mask y terminar en j. O(2^k k^2)
+def held_karp(dist):
+    k = len(dist) - 2
+    if k == 0:
+        return []
+    full = (1 << k) - 1
+    best = [[INFINITY] * k for _ in range(1 << k)]
+    back = [[-1] * k for _ in range(1 << k)]
+    for j in range(k):
+        best[1 << j][j] = dist[0][j + 1]
+
+    for mask in range(1, 1 << k):
+        row = best[mask]
+        for j in range(k):
+            cost = row[j]
+            if cost == INFINITY:
+                continue
+            for n in range(k):
+                if mask >> n & 1:
+                    continue
+                new = cost + dist[j + 1][n + 1]
+                following = mask | 1 << n
+                if new < best[following][n]:
+                    best[following][n] = new
+                    back[following][n] = j
+
+    last = min(range(k), key=lambda j: best[full][j] + dist[j + 1][k + 1])
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last)
+        last, mask = back[mask][last], mask ^ 1 << last
+    order.reverse()
+    return order
+
+
+# Orden aproximado: vecino más cercano y luego 2-opt (invertir tramos mientras acorte el recorrido)
+def approximate_order(dist):
+    k = len(dist) - 2
+    remaining = set(range(k))
+    route = [0]
+    while remaining:
+        current = route[-1]
+        following = min(remaining, key=lambda j: dist[current][j + 1])
+        remaining.remove(following)
+        route.append(following + 1)
+    route.append(k + 1)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, k):
+            for j in range(i + 1, k + 1):
+                a, b = route[i - 1], route[i]
+                c, d = route[j], route[j + 1]
+                if dist[a][c] + dist[b][d] < dist[a][b] + dist[c][d]:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return [node - 1 for node in route[1:-1]]
+
+
+# Recorrido de inicio a meta pasando por todos los checkpoints. searches es la caché de
+# WaypointSearch del laberinto (una por celda de origen). Devuelve (orden, solución, explorados)
+def plan_tour(maze, checkpoints, searches):
+    checkpoints = [tuple(cell) for cell in checkpoints]
+    for row, col in checkpoints:
+        if not (0 <= row < maze.height and 0 <= col < maze.width) or maze.walls[row][col]:
+            raise Exception("checkpoint must be an open cell")
+
+    # Rechazar de inmediato si algún punto está en otra componente
+    points = [maze.start] + checkpoints + [maze.goal]
+    if any(not maze.connected(maze.start, point) for point in points):
+        raise Exception("no solution")
+
+    # Un BFS multi-meta por cada origen (el inicio y cada checkpoint); la meta no lo necesita
+    num_explored = 0
+    dist = [[0] * len(points) for _ in points]
+    for i, source in enumerate(points[:-1]):
+        search = searches.pop(source, None)
+        if search is None:
+            search = WaypointSearch(maze, source)
+        searches[source] = search
+        num_explored += search.reach(points)
+        for j, target in enumerate(points):
+            dist[i][j] = dist[j][i] = search.distance(target)
+    while len(searches) > max(CACHE_SIZE, len(points)):
+        del searches[next(iter(searches))]
+
+    if len(checkpoints) <= HELD_KARP_LIMIT:
+        order = held_karp(dist)
+    else:
+        order = approximate_order(dist)
+
+    # Unir los tramos con los caminos ya guardados en cada búsqueda
+    actions = []
+    cells = []
+    route = [maze.start] + [checkpoints[i] for i in order] + [maze.goal]
+    for source, target in zip(route, route[1:]):
+        leg_actions, leg_cells = searches[source].path(target)
+        actions.extend(leg_actions)
+        cells.extend(leg_cells)
+    return order, (actions, cells), num_explored
@@ -0,0 +1,114 @@
+from array import array
+from collections import deque
+
+ACTIONS = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+
+
+# En un laberinto perfecto (sin ciclos) las celdas abiertas de cada componente forman un árbol
+def is_perfect(maze):
+    cells = 0
+    edges = 0
+    for i in range(maze.height):
+        row = maze.walls[i]
+        below = maze.walls[i + 1] if i + 1 < maze.height else None
+        for j in range(maze.width):
+            if row[j]:
+                continue
+            cells += 1
+            if j + 1 < maze.width and not row[j + 1]:
+                edges += 1
+            if below is not None and not below[j]:
+                edges += 1
+    maze.components()
+    return edges == cells - maze.num_components
+
+
+# Índice de árbol: cada componente se enraíza en una celda, se guarda la profundidad de cada
+# celda y sus ancestros a distancia 2^k (binary lifting) para hallar el ancestro común en O(log n)
+class TreeIndex():
+    def __init__(self, maze):
+        width = maze.width
+        size = maze.height * width
+        self.width = width
+        self.labels = maze.components()
+        self.depth = array("i", [0]) * size
+        parent = array("i", range(size))  # Las raíces y las paredes son su propio padre
+
+        seen = bytearray(size)
+        for root in range(size):
+            if seen[root] or maze.walls[root // width][root % width]:
+                continue
+            seen[root] = 1
+            queue = deque([root])
+            while queue:
+                index = queue.popleft()
+                for _, (r, c) in maze.neighbors(divmod(index, width)):
+                    child = r * width + c
+                    if not seen[child]:
+                        seen[child] = 1
+                        parent[child] = index
+                        self.depth[child] = self.depth[index] + 1
+                        queue.append(child)
+
+        self.up = [parent]
+        for _ in range(max(self.depth, default=0).bit_length() - 1):
+            previous = self.up[-1]
+            self.up.append(array("i", [previous[p] for p in previous]))
+
+    def lca(self, a, b):
+        depth = self.depth
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = self.up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for table in reversed(self.up):
+            if table[a] != table[b]:
+                a = table[a]
+                b = table[b]
+        return self.up[0][a]
+
+    # Distancia entre dos celdas en O(log n), o None si están en componentes distintas
+    def distance(self, a, b):
+        a = a[0] * self.width + a[1]
+        b = b[0] * self.width + b[1]
+        if self.labels[a] == -1 or self.labels[a] != self.labels[b]:
+            return None
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self.lca(a, b)]
+
+    # Único camino entre dos celdas en O(largo del camino), como (acciones, celdas)
+    def path(self, a, b):
+        width = self.width
+        a = a[0] * width + a[1]
+        b = b[0] * width + b[1]
+        if self.labels[a] == -1 or self.labels[a] != self.labels[b]:
+            raise Exception("no solution")
+        top = self.lca(a, b)
+        parent = self.up[0]
+        row, col = divmod(a, width)
+
+        # Subir desde a hasta el ancestro común y bajar hasta b (la bajada se arma al revés)
+        steps = []
+        while a != top:
+            a = parent[a]
+            steps.append(a)
+        down = []
+        while b != top:
+            down.append(b)
+            b = parent[b]
+        steps.extend(reversed(down))
+
+        actions = []
+        cells = []
+        for index in steps:
+            r, c = divmod(index, width)
+            actions.append(ACTIONS[(r - row, c - col)])
+            cells.append((r, c))
+            row, col = r, c
+        return actions, cells
@@ -1,6 +1,9 @@
-import pygame
+import os
 import sys
 import time
+from array import array
+
+from instrumentation import SearchStats
 
 # Clase Nodo para la estructura de búsqueda
 class Node():
@@ -38,7 +41,10 @@ class GreedyFrontier():
 
 # Clase para manejar el laberinto y su solución
 class Maze():
-    def __init__(self, filename):
+    def __init__(self, filename, stats=None):
+        self.stats = stats
+        if stats is not None:
+            stats.start("parse")
         with open(filename) as f:
             contents = f.read()
 
@@ -73,8 +79,12 @@ class Maze():
                     row.append(False)
             self.walls.append(row)
 
+        if stats is not None:
+            stats.stop()
+
         self.solution = None
         self.num_explored = 0
+        self.labels = None
 
     # Función para obtener vecinos válidos
     def neighbors(self, state):
@@ -92,24 +102,69 @@ class Maze():
                 result.append((action, (r, c)))
         return result
 
+    # Etiquetar las componentes conexas de las celdas abiertas (se calcula una sola vez)
+    def components(self):
+        if self.labels is None:
+            width = self.width
+            labels = array("i", [-1]) * (self.height * width)
+            count = 0
+            for i in range(self.height):
+                for j in range(width):
+                    if self.walls[i][j] or labels[i * width + j] != -1:
+                        continue
+                    labels[i * width + j] = count
+                    stack = [(i, j)]
+                    while stack:
+                        for _, (r, c) in self.neighbors(stack.pop()):
+                            if labels[r * width + c] == -1:
+                                labels[r * width + c] = count
+                                stack.append((r, c))
+                    count += 1
+            self.labels = labels
+            self.num_components = count
+        return self.labels
+
+    # Componente de una celda (-1 si es pared)
+    def component(self, state):
+        return self.components()[state[0] * self.width + state[1]]
+
+    def connected(self, a, b):
+        return self.component(a) == self.component(b)
+
     # Resolución del laberinto utilizando el algoritmo Greedy
     def solve_greedy(self):
         self.num_explored = 0
 
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
         start = Node(state=self.start, parent=None, action=None)
         frontier = GreedyFrontier(self.goal)
         frontier.add(start)
+        if stats is not None:
+            stats.generate(self.start, 1)
 
         self.explored = set()
 
         while True:
             if frontier.empty():
+                if stats is not None:
+                    stats.stop()
                 raise Exception("no solution")
 
             node = frontier.remove()
             self.num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
 
             if node.state == self.goal:
+                if stats is not None:
+                    stats.start("reconstruct")
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -119,6 +174,8 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                if stats is not None:
+                    stats.stop()
                 return
 
             self.explored.add(node.state)
@@ -127,9 +184,15 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif stats is not None:
+                    stats.duplicate(state)
 
     # Imprimir el laberinto y la solución
     def print(self):
+        if self.stats is not None:
+            self.stats.start("render")
         solution = self.solution[1] if self.solution is not None else None
         for i, row in enumerate(self.walls):
             for j, col in enumerate(row):
@@ -144,9 +207,15 @@ class Maze():
                 else:
                     print(" ", end="")
             print()
+        if self.stats is not None:
+            self.stats.stop()
 
 # Dibujar el laberinto y la solución en Pygame
 def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
+    import pygame
+
+    if maze.stats is not None:
+        maze.stats.start("render")
     CELL_SIZE = 40
     ROWS = maze.height
     COLS = maze.width
@@ -169,21 +238,29 @@ def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
 
     # Dibujar meta (toro)
     screen.blit(bull_img, (maze.goal[1] * CELL_SIZE, maze.goal[0] * CELL_SIZE))
+    if maze.stats is not None:
+        maze.stats.stop()
 
 # Dibujar botones
 def draw_button(screen, text, rect, color):
+    import pygame
+
     pygame.draw.rect(screen, color, rect)
     font = pygame.font.Font(None, 36)
     text_surf = font.render(text, True, (255, 255, 255))
     text_rect = text_surf.get_rect(center=rect.center)
     screen.blit(text_surf, text_rect)
 
-# Inicializar Pygame
-def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python laberinto.py laberinto.txt")
+# Resolver sin interfaz gráfica (no se importa pygame)
+def run_headless(m):
+    m.solve_greedy()
+    print("Estados explorados:", m.num_explored)
+    print("Solución:")
+    m.print()
 
-    m = Maze(sys.argv[1])
+# Inicializar Pygame
+def run_gui(m):
+    import pygame
 
     pygame.init()
     CELL_SIZE = 40
@@ -199,7 +276,6 @@ def main():
     game_start_time = None
     elapsed_time = 0
 
-    button_bfs = pygame.Rect(10, HEIGHT - 80, 160, 50)
     button_greedy = pygame.Rect(180, HEIGHT - 80, 160, 50)
     button_manual = pygame.Rect(350, HEIGHT - 80, 160, 50)
     button_reset = pygame.Rect(520, HEIGHT - 80, 120, 50)
@@ -225,14 +301,6 @@ def main():
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = event.pos
 
-                # Acción del botón "BFS"
-                if button_bfs.collidepoint(mouse_pos):
-                    if not show_solution:
-                        m.solve()  # BFS
-                        path = m.solution[1]
-                        show_solution = True
-                        manual_mode = False
-
                 # Acción del botón "Greedy"
                 if button_greedy.collidepoint(mouse_pos):
                     if not show_solution:
@@ -299,6 +367,25 @@ def main():
 
     pygame.quit()
 
+# Punto de entrada: interfaz gráfica, o solo la solución en texto con --headless
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--headless"]
+    headless = len(args) < len(sys.argv) - 1
+    if len(args) != 1:
+        sys.exit("Usage: python laberinto.py laberinto.txt [--headless]")
+
+    # LABERINTO_STATS=archivo.json activa la instrumentación y la exporta al salir
+    stats_file = os.environ.get("LABERINTO_STATS")
+    m = Maze(args[0], SearchStats() if stats_file else None)
+
+    if headless:
+        run_headless(m)
+    else:
+        run_gui(m)
+
+    if stats_file:
+        m.stats.to_json(stats_file)
+
 
 if __name__ == "__main__":
     main()
@@ -1 +1,230 @@
-
+import os
+import sys
+from array import array
+
+from instrumentation import SearchStats
+
+# Clase Nodo para la estructura de búsqueda
+class Node():
+    def __init__(self, state, parent, action):
+        self.state = state
+        self.parent = parent
+        self.action = action
+
+# Clase para gestionar la frontera (usaremos cola para BFS)
+class QueueFrontier():
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[0]
+            self.frontier = self.frontier[1:]
+            return node
+
+# Clase para manejar el laberinto y su solución
+class Maze():
+    def __init__(self, filename, stats=None):
+        self.stats = stats
+        if stats is not None:
+            stats.start("parse")
+        with open(filename) as f:
+            contents = f.read()
+
+        # Validaciones de inicio y meta
+        if contents.count("A") != 1:
+            raise Exception("maze must have exactly one start point")
+        if contents.count("B") != 1:
+            raise Exception("maze must have exactly one goal")
+
+        # Procesar el contenido del laberinto
+        contents = contents.splitlines()
+        self.height = len(contents)
+        self.width = max(len(line) for line in contents)
+
+        # Leer paredes y puntos de inicio/meta
+        self.walls = []
+        for i in range(self.height):
+            row = []
+            for j in range(self.width):
+                try:
+                    if contents[i][j] == "A":
+                        self.start = (i, j)
+                        row.append(False)
+                    elif contents[i][j] == "B":
+                        self.goal = (i, j)
+                        row.append(False)
+                    elif contents[i][j] == " ":
+                        row.append(False)
+                    else:
+                        row.append(True)
+                except IndexError:
+                    row.append(False)
+            self.walls.append(row)
+
+        if stats is not None:
+            stats.stop()
+
+        self.solution = None
+        self.num_explored = 0
+        self.labels = None
+
+    # Función para obtener vecinos válidos
+    def neighbors(self, state):
+        row, col = state
+        candidates = [
+            ("up", (row - 1, col)),
+            ("down", (row + 1, col)),
+            ("left", (row, col - 1)),
+            ("right", (row, col + 1))
+        ]
+
+        result = []
+        for action, (r, c) in candidates:
+            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
+                result.append((action, (r, c)))
+        return result
+
+    # Etiquetar las componentes conexas de las celdas abiertas (se calcula una sola vez)
+    def components(self):
+        if self.labels is None:
+            width = self.width
+            labels = array("i", [-1]) * (self.height * width)
+            count = 0
+            for i in range(self.height):
+                for j in range(width):
+                    if self.walls[i][j] or labels[i * width + j] != -1:
+                        continue
+                    labels[i * width + j] = count
+                    stack = [(i, j)]
+                    while stack:
+                        for _, (r, c) in self.neighbors(stack.pop()):
+                            if labels[r * width + c] == -1:
+                                labels[r * width + c] = count
+                                stack.append((r, c))
+                    count += 1
+            self.labels = labels
+            self.num_components = count
+        return self.labels
+
+    # Componente de una celda (-1 si es pared)
+    def component(self, state):
+        return self.components()[state[0] * self.width + state[1]]
+
+    def connected(self, a, b):
+        return self.component(a) == self.component(b)
+
+    # Resolución del laberinto utilizando BFS
+    def solve(self):
+        self.num_explored = 0
+
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
+        start = Node(state=self.start, parent=None, action=None)
+        frontier = QueueFrontier()
+        frontier.add(start)
+        if stats is not None:
+            stats.generate(self.start, 1)
+
+        self.explored = set()
+
+        while True:
+            if frontier.empty():
+                if stats is not None:
+                    stats.stop()
+                raise Exception("no solution")
+
+            node = frontier.remove()
+            self.num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
+
+            if node.state == self.goal:
+                if stats is not None:
+                    stats.start("reconstruct")
+                actions = []
+                cells = []
+                while node.parent is not None:
+                    actions.append(node.action)
+                    cells.append(node.state)
+                    node = node.parent
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                if stats is not None:
+                    stats.stop()
+                return
+
+            self.explored.add(node.state)
+
+            for action, state in self.neighbors(node.state):
+                if not frontier.contains_state(state) and state not in self.explored:
+                    child = Node(state=state, parent=node, action=action)
+                    frontier.add(child)
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif stats is not None:
+                    stats.duplicate(state)
+
+    # Imprimir el laberinto y la solución
+    def print(self):
+        if self.stats is not None:
+            self.stats.start("render")
+        solution = self.solution[1] if self.solution is not None else None
+        for i, row in enumerate(self.walls):
+            for j, col in enumerate(row):
+                if col:
+                    print("█", end="")
+                elif (i, j) == self.start:
+                    print("A", end="")
+                elif (i, j) == self.goal:
+                    print("B", end="")
+                elif solution is not None and (i, j) in solution:
+                    print("*", end="")
+                else:
+                    print(" ", end="")
+            print()
+        if self.stats is not None:
+            self.stats.stop()
+
+# Resolver sin interfaz gráfica
+def run_headless(m):
+    m.solve()
+    print("Estados explorados:", m.num_explored)
+    print("Solución:")
+    m.print()
+
+# Sin interfaz gráfica siempre; --headless se acepta igual que en laberinto_bfs_pygame.py
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--headless"]
+    if len(args) != 1:
+        sys.exit("Usage: python laberinto.py laberinto.txt [--headless]")
+
+    # LABERINTO_STATS=archivo.json activa la instrumentación y la exporta al terminar
+    stats_file = os.environ.get("LABERINTO_STATS")
+    m = Maze(args[0], SearchStats() if stats_file else None)
+    run_headless(m)
+
+    if stats_file:
+        m.stats.to_json(stats_file)
+
+
+if __name__ == "__main__":
+    main()
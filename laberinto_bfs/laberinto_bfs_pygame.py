@@ -1,147 +1,16 @@
-import pygame
+import os
 import sys
 import time
 
-# Clase Nodo para la estructura de búsqueda
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
-
-# Clase para gestionar la frontera (usaremos cola para BFS)
-class QueueFrontier():
-    def __init__(self):
-        self.frontier = []
-
-    def add(self, node):
-        self.frontier.append(node)
-
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
-
-    def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
-
-# Clase para manejar el laberinto y su solución
-class Maze():
-    def __init__(self, filename):
-        with open(filename) as f:
-            contents = f.read()
-
-        # Validaciones de inicio y meta
-        if contents.count("A") != 1:
-            raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
-            raise Exception("maze must have exactly one goal")
-
-        # Procesar el contenido del laberinto
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Leer paredes y puntos de inicio/meta
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
-
-        self.solution = None
-        self.num_explored = 0
-
-    # Función para obtener vecinos válidos
-    def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
-
-    # Resolución del laberinto utilizando BFS
-    def solve(self):
-        self.num_explored = 0
-
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = QueueFrontier()
-        frontier.add(start)
-
-        self.explored = set()
-
-        while True:
-            if frontier.empty():
-                raise Exception("no solution")
-
-            node = frontier.remove()
-            self.num_explored += 1
-
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return
-
-            self.explored.add(node.state)
-
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
-
-    # Imprimir el laberinto y la solución
-    def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
+from instrumentation import SearchStats
+from laberinto import Maze, run_headless
 
 # Dibujar el laberinto y la solución en Pygame
 def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
+    import pygame
+
+    if maze.stats is not None:
+        maze.stats.start("render")
     CELL_SIZE = 40
     ROWS = maze.height
     COLS = maze.width
@@ -164,9 +33,13 @@ def draw_maze(screen, maze, path, player_pos, wall_img, person_img, bull_img):
 
     # Dibujar meta (toro)
     screen.blit(bull_img, (maze.goal[1] * CELL_SIZE, maze.goal[0] * CELL_SIZE))
+    if maze.stats is not None:
+        maze.stats.stop()
 
 # Dibujar botones
 def draw_button(screen, text, rect, color):
+    import pygame
+
     pygame.draw.rect(screen, color, rect)
     font = pygame.font.Font(None, 36)
     text_surf = font.render(text, True, (255, 255, 255))
@@ -174,11 +47,8 @@ def draw_button(screen, text, rect, color):
     screen.blit(text_surf, text_rect)
 
 # Inicializar Pygame
-def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python laberinto.py laberinto.txt")
-
-    m = Maze(sys.argv[1])
+def run_gui(m):
+    import pygame
 
     pygame.init()
     CELL_SIZE = 40
@@ -284,6 +154,25 @@ def main():
 
     pygame.quit()
 
+# Punto de entrada: interfaz gráfica, o solo la solución en texto con --headless
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--headless"]
+    headless = len(args) < len(sys.argv) - 1
+    if len(args) != 1:
+        sys.exit("Usage: python laberinto_bfs_pygame.py laberinto.txt [--headless]")
+
+    # LABERINTO_STATS=archivo.json activa la instrumentación y la exporta al salir
+    stats_file = os.environ.get("LABERINTO_STATS")
+    m = Maze(args[0], SearchStats() if stats_file else None)
+
+    if headless:
+        run_headless(m)
+    else:
+        run_gui(m)
+
+    if stats_file:
+        m.stats.to_json(stats_file)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,244 @@
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+# Formato de la grilla en disco: cabecera + bloques (tiles) de TILE x TILE celdas, un bit por celda.
+# Guardar por bloques hace que las celdas vecinas queden en la misma página del archivo
+MAGIC = b"LBT1"
+HEADER = struct.Struct("<4s7I")  # magia, alto, ancho, tile, fila/columna de inicio, fila/columna de meta
+TILE = 64
+TILE_BYTES = TILE * TILE // 8
+
+ACTIONS = ["up", "down", "left", "right"]
+MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+# Convertir un laberinto de texto a la grilla por bloques, leyendo de a una franja de TILE filas
+def pack_walls(filename, grid_filename):
+    # Primera pasada: dimensiones, inicio y meta
+    height = 0
+    width = 0
+    start = goal = None
+    starts = goals = 0
+    with open(filename) as f:
+        for i, line in enumerate(f):
+            line = line.rstrip("\r\n")
+            height += 1
+            width = max(width, len(line))
+            if "A" in line:
+                starts += line.count("A")
+                start = (i, line.index("A"))
+            if "B" in line:
+                goals += line.count("B")
+                goal = (i, line.index("B"))
+    if starts != 1:
+        raise Exception("maze must have exactly one start point")
+    if goals != 1:
+        raise Exception("maze must have exactly one goal")
+
+    tile_cols = (width + TILE - 1) // TILE
+    band_bytes = tile_cols * TILE_BYTES
+
+    # Segunda pasada: escribir cada franja de filas como una fila de bloques
+    with open(filename) as f, open(grid_filename, "wb") as out:
+        out.write(HEADER.pack(MAGIC, height, width, TILE, start[0], start[1], goal[0], goal[1]))
+        band = bytearray(band_bytes)
+        row = 0
+        for line in f:
+            line = line.rstrip("\r\n")
+            r = row % TILE
+            for c, char in enumerate(line):
+                # Igual que Maze: espacio, A y B son libres; lo que falta al final de la línea también
+                if char not in " AB":
+                    bit = r * TILE + c % TILE
+                    band[(c // TILE) * TILE_BYTES + (bit >> 3)] |= 1 << (bit & 7)
+            row += 1
+            if row % TILE == 0:
+                out.write(band)
+                band = bytearray(band_bytes)
+        if row % TILE:
+            out.write(band)
+
+
+# Grilla de paredes mapeada en memoria: solo se leen del disco los bloques que se tocan
+class WallGrid():
+    def __init__(self, grid_filename):
+        self.file = open(grid_filename, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.height, self.width, self.tile, r0, c0, r1, c1 = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise Exception("not a maze grid file")
+        self.start = (r0, c0)
+        self.goal = (r1, c1)
+        self.tile_cols = (self.width + self.tile - 1) // self.tile
+        self.tile_bytes = self.tile * self.tile // 8
+
+    def is_wall(self, row, col):
+        tile = self.tile
+        index = (row // tile) * self.tile_cols + col // tile
+        bit = (row % tile) * tile + col % tile
+        return self.map[HEADER.size + index * self.tile_bytes + (bit >> 3)] >> (bit & 7) & 1
+
+    def neighbors(self, state):
+        row, col = state
+        result = []
+        for action, (dr, dc) in zip(ACTIONS, MOVES):
+            r, c = row + dr, col + dc
+            if 0 <= r < self.height and 0 <= c < self.width and not self.is_wall(r, c):
+                result.append((action, (r, c)))
+        return result
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+# Arreglo de bits (o de grupos de bits) en un archivo mapeado en memoria
+class MappedBits():
+    def __init__(self, filename, size, bits=1):
+        self.bits = bits
+        with open(filename, "wb") as f:
+            f.truncate((size * bits + 7) // 8)  # Archivo disperso: no ocupa disco hasta que se escribe
+        self.file = open(filename, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def get(self, index):
+        bit = index * self.bits
+        return self.map[bit >> 3] >> (bit & 7) & ((1 << self.bits) - 1)
+
+    def set(self, index, value):
+        bit = index * self.bits
+        byte = self.map[bit >> 3] & ~(((1 << self.bits) - 1) << (bit & 7))
+        self.map[bit >> 3] = byte | (value << (bit & 7))
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+# Cola de celdas que guarda en memoria a lo sumo buffer_size elementos y el resto en disco
+class SpillQueue():
+    def __init__(self, filename, buffer_size):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.buffer = array("q")
+        self.file = open(filename, "w+b")
+        self.spilled = 0
+
+    def __len__(self):
+        return self.spilled + len(self.buffer)
+
+    def add(self, index):
+        self.buffer.append(index)
+        if len(self.buffer) >= self.buffer_size:
+            self.buffer.tofile(self.file)
+            self.spilled += len(self.buffer)
+            self.buffer = array("q")
+
+    # Recorrer la cola (primero lo que está en disco, en trozos) y vaciarla
+    def drain(self):
+        self.file.seek(0)
+        remaining = self.spilled
+        while remaining:
+            chunk = array("q")
+            chunk.fromfile(self.file, min(remaining, self.buffer_size))
+            remaining -= len(chunk)
+            yield from chunk
+        buffer = self.buffer
+        self.buffer = array("q")
+        yield from buffer
+        self.file.seek(0)
+        self.file.truncate()
+        self.spilled = 0
+
+    def close(self):
+        self.file.close()
+
+
+# BFS por niveles fuera de memoria: paredes y visitados en archivos mapeados, frontera que
+# se vuelca al disco y, por celda, 2 bits con la acción que llevó a ella para reconstruir el camino
+def solve_out_of_core(grid_filename, workdir=None, buffer_size=1 << 16):
+    grid = WallGrid(grid_filename)
+    tmp = tempfile.mkdtemp(prefix="laberinto-", dir=workdir)
+    height = grid.height
+    width = grid.width
+    size = height * width
+    visited = MappedBits(os.path.join(tmp, "visited"), size)
+    parents = MappedBits(os.path.join(tmp, "parents"), size, bits=2)
+    current = SpillQueue(os.path.join(tmp, "frontier-a"), buffer_size)
+    following = SpillQueue(os.path.join(tmp, "frontier-b"), buffer_size)
+
+    try:
+        start = grid.start[0] * width + grid.start[1]
+        goal = grid.goal[0] * width + grid.goal[1]
+        visited.set(start, 1)
+        current.add(start)
+        num_explored = 0
+        found = False
+
+        while len(current) and not found:
+            for index in current.drain():
+                num_explored += 1
+                row, col = divmod(index, width)
+                for move, (dr, dc) in enumerate(MOVES):
+                    r, c = row + dr, col + dc
+                    if not (0 <= r < height and 0 <= c < width) or grid.is_wall(r, c):
+                        continue
+                    neighbor = r * width + c
+                    if visited.get(neighbor):
+                        continue
+                    visited.set(neighbor, 1)
+                    parents.set(neighbor, move)
+                    if neighbor == goal:
+                        found = True
+                        break
+                    following.add(neighbor)
+                if found:
+                    break
+            current, following = following, current
+
+        if not found:
+            raise Exception("no solution")
+
+        # Reconstruir el camino desde la meta siguiendo las acciones hacia atrás
+        actions = []
+        cells = []
+        index = goal
+        while index != start:
+            move = parents.get(index)
+            row, col = divmod(index, width)
+            actions.append(ACTIONS[move])
+            cells.append((row, col))
+            index = (row - MOVES[move][0]) * width + col - MOVES[move][1]
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells), num_explored
+    finally:
+        current.close()
+        following.close()
+        visited.close()
+        parents.close()
+        grid.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python outofcore.py laberinto.txt [directorio_temporal]")
+
+    filename = sys.argv[1]
+    grid_filename = filename + ".grid"
+    if not os.path.exists(grid_filename) or os.path.getmtime(grid_filename) < os.path.getmtime(filename):
+        pack_walls(filename, grid_filename)
+
+    solution, num_explored = solve_out_of_core(grid_filename, sys.argv[2] if len(sys.argv) == 3 else None)
+    print("Estados explorados:", num_explored)
+    print("Largo de la solución:", len(solution[0]))
+
+
+if __name__ == "__main__":
+    main()
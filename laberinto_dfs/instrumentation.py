@@ -0,0 +1,91 @@
+import time
+
+
+# Clase para medir una búsqueda: nodos, frontera, tiempos por fase y memoria
+class SearchStats():
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.observers = []
+        self.reset()
+
+    def reset(self):
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.duplicates_avoided = 0
+        self.timings = {}
+        self.memory_peak = None
+        self.phase = None
+        self.phase_start = 0.0
+        self.owns_tracing = False
+
+    # Registrar una función observer(evento, estado, stats) para cada evento de la búsqueda
+    def subscribe(self, observer):
+        self.observers.append(observer)
+
+    def notify(self, event, state):
+        for observer in self.observers:
+            observer(event, state, self)
+
+    # Fases: "parse", "search", "reconstruct", "render"; el tiempo se acumula por fase
+    def start(self, phase):
+        self.stop()
+        if self.trace_memory and phase == "search":
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.owns_tracing = True
+            tracemalloc.reset_peak()
+        self.phase = phase
+        self.phase_start = time.perf_counter()
+
+    def stop(self):
+        if self.phase is None:
+            return
+        elapsed = time.perf_counter() - self.phase_start
+        self.timings[self.phase] = self.timings.get(self.phase, 0.0) + elapsed
+        if self.trace_memory and self.phase == "search":
+            import tracemalloc
+            peak = tracemalloc.get_traced_memory()[1]
+            self.memory_peak = max(self.memory_peak or 0, peak)
+            if self.owns_tracing:
+                tracemalloc.stop()
+                self.owns_tracing = False
+        self.phase = None
+
+    def expand(self, state):
+        self.nodes_expanded += 1
+        if self.observers:
+            self.notify("expand", state)
+
+    def generate(self, state, frontier_size):
+        self.nodes_generated += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if self.observers:
+            self.notify("generate", state)
+
+    def duplicate(self, state):
+        self.duplicates_avoided += 1
+        if self.observers:
+            self.notify("duplicate", state)
+
+    def to_dict(self):
+        return {
+            "nodes_generated": self.nodes_generated,
+            "nodes_expanded": self.nodes_expanded,
+            "peak_frontier": self.peak_frontier,
+            "duplicates_avoided": self.duplicates_avoided,
+            "timings": dict(self.timings),
+            "memory_peak": self.memory_peak,
+        }
+
+    # Exportar a JSON; si se da un archivo también se escribe en él
+    def to_json(self, filename=None):
+        import json
+
+        data = json.dumps(self.to_dict(), indent=2)
+        if filename is not None:
+            with open(filename, "w") as f:
+                f.write(data)
+        return data
@@ -1,4 +1,8 @@
+import os
 import sys
+from array import array
+
+from instrumentation import SearchStats
 
 class Node():
     def __init__(self, state, parent, action):
@@ -41,7 +45,11 @@ class QueueFrontier(StackFrontier):
 
 class Maze():
 
-    def __init__(self, filename):
+    def __init__(self, filename, stats=None):
+
+        self.stats = stats
+        if stats is not None:
+            stats.start("parse")
 
         with open(filename) as f:
             contents = f.read()
@@ -77,10 +85,16 @@ class Maze():
                     row.append(False)
             self.walls.append(row)
 
+        if stats is not None:
+            stats.stop()
+
         self.solution = None
+        self.labels = None
 
 
     def print(self):
+        if self.stats is not None:
+            self.stats.start("render")
         solution = self.solution[1] if self.solution is not None else None
         print()
         for i, row in enumerate(self.walls):
@@ -96,6 +110,8 @@ class Maze():
                 else:
                     print(" ", end="")
             print()
+        if self.stats is not None:
+            self.stats.stop()
         print()
 
 
@@ -115,25 +131,73 @@ class Maze():
         return result
 
 
+    # Etiquetar las componentes conexas de las celdas abiertas (se calcula una sola vez)
+    def components(self):
+        if self.labels is None:
+            width = self.width
+            labels = array("i", [-1]) * (self.height * width)
+            count = 0
+            for i in range(self.height):
+                for j in range(width):
+                    if self.walls[i][j] or labels[i * width + j] != -1:
+                        continue
+                    labels[i * width + j] = count
+                    stack = [(i, j)]
+                    while stack:
+                        for _, (r, c) in self.neighbors(stack.pop()):
+                            if labels[r * width + c] == -1:
+                                labels[r * width + c] = count
+                                stack.append((r, c))
+                    count += 1
+            self.labels = labels
+            self.num_components = count
+        return self.labels
+
+
+    # Componente de una celda (-1 si es pared)
+    def component(self, state):
+        return self.components()[state[0] * self.width + state[1]]
+
+
+    def connected(self, a, b):
+        return self.component(a) == self.component(b)
+
+
     def solve(self):
    
         self.num_explored = 0
 
+        # Rechazar de inmediato si el inicio y la meta están en componentes distintas
+        if not self.connected(self.start, self.goal):
+            raise Exception("no solution")
+
+        stats = self.stats
+        if stats is not None:
+            stats.start("search")
+
         start = Node(state=self.start, parent=None, action=None)
         frontier = QueueFrontier()
         frontier.add(start)
+        if stats is not None:
+            stats.generate(self.start, 1)
 
         self.explored = set()
 
         while True:
 
             if frontier.empty():
+                if stats is not None:
+                    stats.stop()
                 raise Exception("no solution")
 
             node = frontier.remove()
             self.num_explored += 1
+            if stats is not None:
+                stats.expand(node.state)
 
             if node.state == self.goal:
+                if stats is not None:
+                    stats.start("reconstruct")
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -143,6 +207,8 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                if stats is not None:
+                    stats.stop()
                 return
 
             self.explored.add(node.state)
@@ -152,10 +218,16 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+                    if stats is not None:
+                        stats.generate(state, len(frontier.frontier))
+                elif stats is not None:
+                    stats.duplicate(state)
 
 
     def output_image(self, filename, show_solution=True, show_explored=False):
         from PIL import Image, ImageDraw
+        if self.stats is not None:
+            self.stats.start("render")
         cell_size = 50
         cell_border = 2
 
@@ -203,17 +275,33 @@ class Maze():
                 )
 
         img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python laberinto.py laberinto.txt")
-
-m = Maze(sys.argv[1])
-print("Labetinto:")
-m.print()
-print("Solucionando...")
-m.solve()
-print("Estados explorados:", m.num_explored)
-print("Solución:")
-m.print()
-m.output_image("laberinto.png", show_explored=False )
+        if self.stats is not None:
+            self.stats.stop()
+
+
+# El script se puede importar como librería; con --headless no genera la imagen (no importa PIL)
+def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--headless"]
+    headless = len(args) < len(sys.argv) - 1
+    if len(args) != 1:
+        sys.exit("Usage: python laberinto.py laberinto.txt [--headless]")
+
+    # LABERINTO_STATS=archivo.json activa la instrumentación y la exporta al terminar
+    stats_file = os.environ.get("LABERINTO_STATS")
+    m = Maze(args[0], SearchStats() if stats_file else None)
+    print("Labetinto:")
+    m.print()
+    print("Solucionando...")
+    m.solve()
+    print("Estados explorados:", m.num_explored)
+    print("Solución:")
+    m.print()
+    if not headless:
+        m.output_image("laberinto.png", show_explored=False )
+
+    if stats_file:
+        m.stats.to_json(stats_file)
+
+
+if __name__ == "__main__":
+    main()